@@ -4,329 +4,113 @@ Intelligent role matching with compatibility scores
 """
 
 
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, stream_template
 import sqlite3
 import os
 
-# Auto-create database if it does not exist (for Railway)
-if not os.path.exists("database/career_compass.db"):
-    import init_database
+import click
 
+import hmac
 import json
 from datetime import datetime
 
+from assets import init_app as init_assets
+from catalog import bump_catalog_version, get_catalog, schedule_reload
+from dashboard import dashboard_filters, iter_students, page_size, students_page
+from db import connect, get_db, get_pool, init_app as init_db
+from importer import CatalogError, import_catalog, read_catalog
+from metrics import init_app as init_metrics, register_collector
+from migrations import migrate
+from profiles import load_profile, save_skills_and_interests
+from progress import (apply_topic_completed, enrollments_with_progress, progress_etag,
+                      progress_state, progress_version, role_progress_state, role_topic_ids,
+                      topic_total)
+from recommendations import (cached_recommendations, get_recommendation_cache, load_recommendations,
+                             rank_profile, store_recommendations)
+from resources import get_mdn_link
+from rescore import main as rescore_main
+from responses import conditional_json, init_app as init_responses
+from roadmaps import get_roadmap_bootstrap, get_roadmap_document, roadmap_etag
+from startup import init_app as init_startup, warm_up
+from writer import get_writer, submit_write
+
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here-change-in-production'
 
-DATABASE = 'career_compass.db'
+# Bearer token for POST /api/admin/reload-catalog (endpoint disabled when unset)
+CATALOG_ADMIN_TOKEN = os.environ.get('CATALOG_ADMIN_TOKEN', '')
 
-def get_mdn_link(topic_name):
-    """
-    Map topic names to MDN (Mozilla Developer Network) documentation URLs.
-    Returns appropriate learning resource link based on topic name.
-    """
-    topic_lower = topic_name.lower()
-    
-    # Comprehensive MDN mapping
-    mdn_mappings = {
-        # Web Fundamentals
-        'html': 'https://developer.mozilla.org/en-US/docs/Learn/HTML',
-        'html basics': 'https://developer.mozilla.org/en-US/docs/Learn/HTML/Introduction_to_HTML',
-        'html5': 'https://developer.mozilla.org/en-US/docs/Web/HTML',
-        'css': 'https://developer.mozilla.org/en-US/docs/Learn/CSS',
-        'css basics': 'https://developer.mozilla.org/en-US/docs/Learn/CSS/First_steps',
-        'css3': 'https://developer.mozilla.org/en-US/docs/Web/CSS',
-        'javascript': 'https://developer.mozilla.org/en-US/docs/Learn/JavaScript',
-        'javascript basics': 'https://developer.mozilla.org/en-US/docs/Learn/JavaScript/First_steps',
-        'js': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript',
-        
-        # Programming Fundamentals
-        'python': 'https://docs.python.org/3/tutorial/',
-        'python basics': 'https://docs.python.org/3/tutorial/introduction.html',
-        'java': 'https://docs.oracle.com/javase/tutorial/',
-        'c++': 'https://cplusplus.com/doc/tutorial/',
-        'c': 'https://www.learn-c.org/',
-        
-        # Data Structures & Algorithms
-        'data structures': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript/Data_structures',
-        'algorithms': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide',
-        'arrays': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript/Reference/Global_Objects/Array',
-        'linked lists': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide/Indexed_collections',
-        'trees': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide',
-        'graphs': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide',
-        
-        # Web Development
-        'dom': 'https://developer.mozilla.org/en-US/docs/Web/API/Document_Object_Model',
-        'dom manipulation': 'https://developer.mozilla.org/en-US/docs/Learn/JavaScript/Client-side_web_APIs/Manipulating_documents',
-        'ajax': 'https://developer.mozilla.org/en-US/docs/Web/Guide/AJAX',
-        'fetch api': 'https://developer.mozilla.org/en-US/docs/Web/API/Fetch_API',
-        'promises': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript/Reference/Global_Objects/Promise',
-        'async/await': 'https://developer.mozilla.org/en-US/docs/Learn/JavaScript/Asynchronous/Promises',
-        
-        # Frameworks & Libraries
-        'react': 'https://react.dev/learn',
-        'vue': 'https://vuejs.org/guide/introduction.html',
-        'angular': 'https://angular.io/docs',
-        'node.js': 'https://nodejs.org/en/docs/guides/getting-started-guide',
-        'express': 'https://expressjs.com/en/starter/installing.html',
-        'django': 'https://docs.djangoproject.com/en/stable/intro/tutorial01/',
-        'flask': 'https://flask.palletsprojects.com/en/latest/quickstart/',
-        
-        # Databases
-        'sql': 'https://www.w3schools.com/sql/',
-        'mysql': 'https://dev.mysql.com/doc/',
-        'postgresql': 'https://www.postgresql.org/docs/current/tutorial.html',
-        'mongodb': 'https://www.mongodb.com/docs/manual/tutorial/',
-        'database design': 'https://developer.mozilla.org/en-US/docs/Learn/Server-side/First_steps/Introduction',
-        
-        # Version Control
-        'git': 'https://git-scm.com/doc',
-        'github': 'https://docs.github.com/en/get-started',
-        'version control': 'https://git-scm.com/book/en/v2/Getting-Started-About-Version-Control',
-        
-        # APIs & Web Services
-        'rest api': 'https://developer.mozilla.org/en-US/docs/Glossary/REST',
-        'restful': 'https://developer.mozilla.org/en-US/docs/Glossary/REST',
-        'graphql': 'https://graphql.org/learn/',
-        'api': 'https://developer.mozilla.org/en-US/docs/Learn/JavaScript/Client-side_web_APIs/Introduction',
-        
-        # Testing
-        'unit testing': 'https://developer.mozilla.org/en-US/docs/Learn/Tools_and_testing/Cross_browser_testing',
-        'testing': 'https://developer.mozilla.org/en-US/docs/Learn/Tools_and_testing',
-        'jest': 'https://jestjs.io/docs/getting-started',
-        
-        # DevOps & Tools
-        'docker': 'https://docs.docker.com/get-started/',
-        'kubernetes': 'https://kubernetes.io/docs/tutorials/',
-        'ci/cd': 'https://developer.mozilla.org/en-US/docs/Learn/Tools_and_testing/Understanding_client-side_tools',
-        
-        # Security
-        'web security': 'https://developer.mozilla.org/en-US/docs/Web/Security',
-        'https': 'https://developer.mozilla.org/en-US/docs/Glossary/HTTPS',
-        'authentication': 'https://developer.mozilla.org/en-US/docs/Web/HTTP/Authentication',
-        'oauth': 'https://oauth.net/2/',
-        
-        # Performance
-        'performance': 'https://developer.mozilla.org/en-US/docs/Web/Performance',
-        'optimization': 'https://developer.mozilla.org/en-US/docs/Learn/Performance',
-        
-        # Mobile
-        'responsive design': 'https://developer.mozilla.org/en-US/docs/Learn/CSS/CSS_layout/Responsive_Design',
-        'mobile development': 'https://developer.mozilla.org/en-US/docs/Web/Progressive_web_apps',
-        
-        # Cloud & Infrastructure
-        'aws': 'https://aws.amazon.com/getting-started/',
-        'azure': 'https://learn.microsoft.com/en-us/azure/',
-        'cloud computing': 'https://aws.amazon.com/what-is-cloud-computing/',
-        
-        # AI & ML
-        'machine learning': 'https://developers.google.com/machine-learning/crash-course',
-        'deep learning': 'https://www.deeplearning.ai/',
-        'neural networks': 'https://www.tensorflow.org/tutorials',
-        'tensorflow': 'https://www.tensorflow.org/learn',
-        'pytorch': 'https://pytorch.org/tutorials/',
-        
-        # Data Science
-        'data analysis': 'https://pandas.pydata.org/docs/getting_started/intro_tutorials/',
-        'pandas': 'https://pandas.pydata.org/docs/getting_started/index.html',
-        'numpy': 'https://numpy.org/doc/stable/user/absolute_beginners.html',
-        'data visualization': 'https://matplotlib.org/stable/tutorials/index.html',
-    }
-    
-    # Check for exact matches first
-    for key, url in mdn_mappings.items():
-        if key in topic_lower:
-            return url
-    
-    # Default to MDN web docs if no match
-    return 'https://developer.mozilla.org/en-US/docs/Learn'
+# Database: one pooled connection per request, released on teardown
+init_db(app)
+
+# Fingerprinted, precompressed static files with immutable caching
+init_assets(app)
+
+# gzip/brotli for larger JSON responses (see responses.py)
+init_responses(app)
+
+# Opt-in metrics, Server-Timing and slow-request profiling (see metrics.py)
+init_metrics(app)
+register_collector('db_pool', lambda: get_pool().stats())
+register_collector('recommendation_cache', lambda: get_recommendation_cache().stats())
+register_collector('resource_link_cache', lambda: get_mdn_link.cache_info()._asdict())
+register_collector('write_coordinator', lambda: get_writer().stats())
 
-# Database helper
-def get_db():
-    conn = sqlite3.connect('database/career_compass.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+# /readyz and the warm-up (create/migrate the database, compile the catalog
+# and templates, gc.freeze()); gunicorn.conf.py runs it before forking
+init_startup(app)
 
 @app.before_request
 def require_login():
-    allowed_routes = ['login', 'static', 'index'] # Index redirects to login anyway
+    allowed_routes = ['login', 'static', 'index', 'metrics', 'readyz', 'reload_catalog'] # Index redirects to login anyway
     if request.endpoint not in allowed_routes and 'user_id' not in session:
         return redirect(url_for('login'))
 
 # ==========================================
-# ADVANCED COMPATIBILITY SCORING ENGINE
+# WRITE INTENTS (group-committed by writer.py)
 # ==========================================
 
-def calculate_compatibility(user_profile, role):
-    """
-    Advanced multi-factor compatibility scoring
-    Returns score out of 100 with detailed breakdown
-    """
-    
-    breakdown = {}
-    total_score = 0
-    
-    # FACTOR 1: Specialization Match (30 points)
-    spec_score = 0
-    user_spec = user_profile.get('specialization', '')
-    
-    if user_spec == role['primary_specialization']:
-        spec_score = 30
-        breakdown['spec_reason'] = f"Perfect match for {user_spec}"
-    elif user_spec in role['related_specializations'].split(','):
-        spec_score = 15
-        breakdown['spec_reason'] = f"Good match for {user_spec}"
-    else:
-        spec_score = 5
-        breakdown['spec_reason'] = "Can transition to this role"
-    
-    breakdown['specialization'] = spec_score
-    total_score += spec_score
-    
-    # FACTOR 2: Skills Match (45 points)
-    user_skills = user_profile.get('skills', {})
-    required_skills = role['tech_stack'].split(',') if role['tech_stack'] else []
+def create_user(conn, name, email, password, user_type):
+    cursor = conn.execute(
+        'INSERT INTO users (name, email, password, user_type, specialization) VALUES (?, ?, ?, ?, ?)',
+        (name, email, password, user_type, 'Not Set'))
+    return cursor.lastrowid
+
+def save_student_profile(conn, user_id, user_profile, ranked, scoring_version):
+    # Update user basic info
+    conn.execute('UPDATE users SET specialization = ?, current_year = ? WHERE id = ?',
+                 (user_profile['specialization'], user_profile['current_year'], user_id))
     
-    matched_skills = []
-    missing_skills = []
-    skills_score = 0
+    # Update preferences
+    # Check if preferences exist
+    existing = conn.execute('SELECT id FROM user_preferences WHERE user_id = ?', (user_id,)).fetchone()
     
-    if required_skills:
-        skill_value = 45.0 / len(required_skills)
-        
-        for req_skill in required_skills:
-            req_skill = req_skill.strip()
-            found = False
-            
-            for user_skill, level in user_skills.items():
-                if req_skill.lower() in user_skill.lower() or user_skill.lower() in req_skill.lower():
-                    found = True
-                    # Weighted by proficiency
-                    if level == 'Advanced':
-                        skills_score += skill_value
-                        matched_skills.append(f"{user_skill} (Advanced ✓)")
-                    elif level == 'Intermediate':
-                        skills_score += skill_value * 0.8
-                        matched_skills.append(f"{user_skill} (Good ✓)")
-                    else:  # Beginner
-                        skills_score += skill_value * 0.5
-                        matched_skills.append(f"{user_skill} (Basic)")
-                    break
-            
-            if not found:
-                missing_skills.append(req_skill)
-    
-    # Cap at 45
-    skills_score = min(45, round(skills_score))
-    breakdown['skills'] = skills_score
-    breakdown['matched_skills'] = matched_skills
-    breakdown['missing_skills'] = missing_skills
-    total_score += skills_score
-    
-    # FACTOR 3: Interest Alignment (20 points)
-    interest_score = 0
-    interests = user_profile.get('interest_areas', [])
-    
-    if role['category'] in interests:
-        interest_score = 20
-        breakdown['interest_reason'] = f"Perfect match with your {role['category']} interest"
-    elif any(interest in role['category'] for interest in interests):
-        interest_score = 10
-        breakdown['interest_reason'] = "Related to your interests"
+    if existing:
+        conn.execute('''
+            UPDATE user_preferences SET 
+            skills = ?, interest_areas = ?, career_goal = ?, timeline = ?
+            WHERE user_id = ?
+        ''', (json.dumps(user_profile['skills']), json.dumps(user_profile['interest_areas']),
+              user_profile['career_goal'], user_profile['timeline'], user_id))
     else:
-        interest_score = 5
-        breakdown['interest_reason'] = "Good career exploration opportunity"
-    
-    breakdown['interest'] = interest_score
-    total_score += interest_score
-    
-    # FACTOR 4: Career Goals (5 points)
-    goal_score = 0
-    career_goal = user_profile.get('career_goal', 'First Job')
-    timeline = user_profile.get('timeline', '6 months')
+        conn.execute('''
+            INSERT INTO user_preferences (user_id, skills, interest_areas, career_goal, timeline)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (user_id, json.dumps(user_profile['skills']), json.dumps(user_profile['interest_areas']),
+              user_profile['career_goal'], user_profile['timeline']))
     
-    if career_goal == 'First Job' and role['entry_friendly']:
-        goal_score += 3
+    # Skills and interests as rows too, for joins and SQL filters
+    save_skills_and_interests(conn, user_id, user_profile['skills'], user_profile['interest_areas'])
     
-    if timeline == '3 months' and role['difficulty'] == 'Beginner':
-        goal_score += 2
-    elif timeline == '6 months' and role['difficulty'] in ['Beginner', 'Intermediate']:
-        goal_score += 2
-    else:
-        goal_score += 1
-    
-    breakdown['goals'] = min(5, goal_score)
-    total_score += breakdown['goals']
-    
-    # BONUSES (up to 10 points)
-    bonus_score = 0
-    bonuses = []
-    
-    if role['demand_level'] == 'Very High':
-        bonus_score += 3
-        bonuses.append("🔥 Very high market demand (+3)")
-    
-    if role['growth_rate'] in ['Fast', 'Very Fast']:
-        bonus_score += 2
-        bonuses.append("🚀 Fast growing field (+2)")
-    
-    if role['remote_friendly']:
-        bonus_score += 2
-        bonuses.append("🏢 Remote work friendly (+2)")
-    
-    if role['entry_friendly'] and user_profile.get('current_year', 3) <= 2:
-        bonus_score += 3
-        bonuses.append("🎓 Perfect for early career (+3)")
-    
-    breakdown['bonuses'] = bonus_score
-    breakdown['bonus_list'] = bonuses
-    total_score += bonus_score
-    
-    # PENALTIES
-    penalty = 0
-    penalties = []
-    
-    if len(missing_skills) >= 3:
-        penalty += 5
-        penalties.append(f"⚠️ Missing {len(missing_skills)} critical skills (-5)")
-    
-    if not role['entry_friendly'] and role['experience_required'] == 'Required':
-        penalty += 3
-        penalties.append("⚠️ Experience preferred (-3)")
-    
-    breakdown['penalties'] = penalty
-    breakdown['penalty_list'] = penalties
-    total_score -= penalty
-    
-    # Final score (0-100)
-    final_score = max(0, min(100, total_score))
-    
-    # Generate grade
-    if final_score >= 90:
-        grade = 'A+'
-        match_level = '🌟 Excellent Match'
-    elif final_score >= 85:
-        grade = 'A'
-        match_level = '✅ Strong Match'
-    elif final_score >= 75:
-        grade = 'B+'
-        match_level = '👍 Good Match'
-    elif final_score >= 65:
-        grade = 'B'
-        match_level = '✓ Decent Match'
-    elif final_score >= 55:
-        grade = 'C+'
-        match_level = '○ Fair Match'
-    else:
-        grade = 'C'
-        match_level = '⚠️ Moderate Match'
-    
-    return {
-        'score': final_score,
-        'grade': grade,
-        'match_level': match_level,
-        'breakdown': breakdown
-    }
+    # Dashboards read these instead of rescoring the profile
+    store_recommendations(conn, user_id, ranked, scoring_version)
+
+def enroll_student(conn, user_id, role_id):
+    cursor = conn.execute(
+        'INSERT INTO student_enrollments (user_id, role_id) VALUES (?, ?)',
+        (user_id, role_id)
+    )
+    return cursor.lastrowid
 
 # ==========================================
 # ROUTES
@@ -369,9 +153,7 @@ def login():
     if action == 'register':
         name = request.form.get('name')
         try:
-            db.execute('INSERT INTO users (name, email, password, user_type, specialization) VALUES (?, ?, ?, ?, ?)',
-                       (name, email, password, user_type, 'Not Set'))
-            db.commit()
+            submit_write(create_user, name, email, password, user_type)
             
             # Auto login
             user = db.execute('SELECT * FROM users WHERE email = ?', (email,)).fetchone()
@@ -387,13 +169,10 @@ def login():
             
         except sqlite3.IntegrityError:
             return "Email already exists", 400
-        finally:
-            db.close()
             
     else: # Login
         user = db.execute('SELECT * FROM users WHERE email = ? AND password = ? AND user_type = ?', 
                           (email, password, user_type)).fetchone()
-        db.close()
         
         if user:
             session['user_id'] = user['id']
@@ -419,70 +198,38 @@ def dashboard():
         return redirect(url_for('login'))
         
     db = get_db()
+    catalog = get_catalog(db)
+    filters = dashboard_filters(request.args)
     
     # Filter by linked child email if available
     child_email = session.get('child_email')
     
-    query = '''
-        SELECT u.id, u.name, u.email, u.specialization, u.current_year, up.* 
-        FROM users u 
-        LEFT JOIN user_preferences up ON u.id = up.user_id 
-        WHERE u.user_type = 'student'
-    '''
-    
-    params = ()
+    # Students are read and scored a chunk at a time while the page streams
+    students = iter_students(db, catalog, filters, child_email)
     
-    if child_email:
-        query += ' AND u.email = ?'
-        params = (child_email,)
-        
-    students_data = db.execute(query, params).fetchall()
-    
-    students_list = []
-    
-    # We need to recalculate roles for each student to show in dashboard
-    roles = db.execute('SELECT * FROM career_roles').fetchall()
-    
-    for student in students_data:
-        if not student['skills']: # Skip users without preferences set
-            continue
-            
-        # Reconstruct profile
-        profile = {
-            'name': student['name'],
-            'specialization': student['specialization'],
-            'skills': json.loads(student['skills']) if student['skills'] else {},
-            'interest_areas': json.loads(student['interest_areas']) if student['interest_areas'] else [],
-            'career_goal': student['career_goal'],
-            'timeline': student['timeline'],
-            'current_year': student['current_year']
-        }
-        
-        # Calculate top roles
-        student_roles = []
-        for role in roles:
-            role_dict = dict(role)
-            compatibility = calculate_compatibility(profile, role_dict)
-            student_roles.append({
-                'name': role_dict['role_name'],
-                'score': compatibility['score']
-            })
-        
-        student_roles.sort(key=lambda x: x['score'], reverse=True)
+    return stream_template('dashboard.html', students=students, filters=filters)
+
+@app.route('/api/dashboard/students')
+def dashboard_students():
+    """
+    One page of the parent dashboard as JSON.
+    Pass ?after=<next_after> from the previous page to continue.
+    """
+    if session.get('user_type') != 'parent':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
         
-        students_list.append({
-            'name': student['name'],
-            'email': student['email'],
-            'career_goal': student['career_goal'],
-            'current_year': student['current_year'],
-            'specialization': student['specialization'],
-            'roles': student_roles[:3], # Top 3
-            'skills': list(profile['skills'].keys()),
-            'interests': profile['interest_areas']
-        })
+    db = get_db()
+    students, next_after = students_page(
+        db, get_catalog(db), dashboard_filters(request.args),
+        child_email=session.get('child_email'),
+        after=request.args.get('after', 0, type=int),
+        limit=page_size(request.args.get('limit')))
     
-    db.close()
-    return render_template('dashboard.html', students=students_list)
+    return jsonify({
+        'success': True,
+        'students': students,
+        'next_after': next_after
+    })
 
 @app.route('/student-dashboard')
 def student_dashboard():
@@ -502,29 +249,27 @@ def student_dashboard():
     # Check if user has completed their profile
     if not preferences or not preferences['skills']:
         # User hasn't completed profile yet
-        db.close()
         return render_template('student_dashboard.html', 
                              user_name=user['name'],
                              has_profile=False)
     
     # Reconstruct profile
-    profile = {
-        'name': user['name'],
-        'specialization': user['specialization'],
-        'skills': json.loads(preferences['skills']) if preferences['skills'] else {},
-        'interest_areas': json.loads(preferences['interest_areas']) if preferences['interest_areas'] else [],
-        'career_goal': preferences['career_goal'],
-        'timeline': preferences['timeline'],
-        'current_year': user['current_year']
-    }
+    profile = load_profile(db, user_id)
     
-    # Get all roles and calculate compatibility
-    roles = db.execute('SELECT * FROM career_roles').fetchall()
+    # Stored recommendations, rescored only if the catalog has changed since
+    catalog = get_catalog(db)
+    stored = load_recommendations(db, [user_id], catalog.scoring_version, limit=5).get(user_id)
+    
+    if stored is None:
+        ranked = rank_profile(profile, catalog)
+        submit_write(store_recommendations, user_id, ranked, catalog.scoring_version)
+        stored = [{'role_id': role.id, 'score': compatibility['score'],
+                   'grade': compatibility['grade'], 'match_level': compatibility['match_level']}
+                  for role, compatibility in ranked[:5]]
     
     role_recommendations = []
-    for role in roles:
-        role_dict = dict(role)
-        compatibility = calculate_compatibility(profile, role_dict)
+    for recommendation in stored:
+        role_dict = catalog.get(recommendation['role_id']).row
         
         role_recommendations.append({
             'id': role_dict['id'],
@@ -533,16 +278,11 @@ def student_dashboard():
             'description': role_dict['description'],
             'salary': role_dict['avg_salary_range'],
             'demand': role_dict['demand_level'],
-            'score': compatibility['score'],
-            'grade': compatibility['grade'],
-            'match_level': compatibility['match_level']
+            'score': recommendation['score'],
+            'grade': recommendation['grade'],
+            'match_level': recommendation['match_level']
         })
     
-    # Sort by score
-    role_recommendations.sort(key=lambda x: x['score'], reverse=True)
-    
-    db.close()
-    
     return render_template('student_dashboard.html',
                          user_name=user['name'],
                          has_profile=True,
@@ -567,49 +307,25 @@ def suggest_roles():
         'current_year': data.get('current_year', 2)
     }
     
-    # Save to database if logged in (or if we can match by email/name - simplistic for now)
-    # We'll rely on session if available, otherwise just calculate
-    if 'user_id' in session and session.get('user_type') == 'student':
-        db = get_db()
-        user_id = session['user_id']
-        
-        # Update user basic info
-        db.execute('UPDATE users SET specialization = ?, current_year = ? WHERE id = ?',
-                   (user_profile['specialization'], user_profile['current_year'], user_id))
-        
-        # Update preferences
-        # Check if preferences exist
-        existing = db.execute('SELECT id FROM user_preferences WHERE user_id = ?', (user_id,)).fetchone()
-        
-        if existing:
-            db.execute('''
-                UPDATE user_preferences SET 
-                skills = ?, interest_areas = ?, career_goal = ?, timeline = ?
-                WHERE user_id = ?
-            ''', (json.dumps(user_profile['skills']), json.dumps(user_profile['interest_areas']),
-                  user_profile['career_goal'], user_profile['timeline'], user_id))
-        else:
-            db.execute('''
-                INSERT INTO user_preferences (user_id, skills, interest_areas, career_goal, timeline)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, json.dumps(user_profile['skills']), json.dumps(user_profile['interest_areas']),
-                  user_profile['career_goal'], user_profile['timeline']))
-            
-        db.commit()
-        db.close()
-    
     # Get all roles
     db = get_db()
-    roles = db.execute('SELECT * FROM career_roles').fetchall()
+    catalog = get_catalog(db)
     
-    # Calculate compatibility for each role
-    role_scores = []
+    # Identical profiles scored against the same catalog share one ranking
+    ranked = cached_recommendations(user_profile, catalog,
+                                    lambda: rank_profile(user_profile, catalog))
     
-    for role in roles:
-        role_dict = dict(role)
-        compatibility = calculate_compatibility(user_profile, role_dict)
-        
-        role_scores.append({
+    # Save to database if logged in (or if we can match by email/name - simplistic for now)
+    # We'll rely on session if available, otherwise just calculate
+    if 'user_id' in session and session.get('user_type') == 'student':
+        submit_write(save_student_profile, session['user_id'], user_profile, ranked,
+                     catalog.scoring_version)
+    
+    # Top 5
+    top_roles = []
+    for role, compatibility in ranked[:5]:
+        role_dict = role.row
+        top_roles.append({
             'role_id': role_dict['id'],
             'role_name': role_dict['role_name'],
             'category': role_dict['category'],
@@ -621,14 +337,6 @@ def suggest_roles():
             'compatibility': compatibility
         })
     
-    # Sort by score
-    role_scores.sort(key=lambda x: x['compatibility']['score'], reverse=True)
-    
-    # Return top 5
-    top_roles = role_scores[:5]
-    
-    db.close()
-    
     return jsonify({
         'success': True,
         'user_name': user_profile['name'],
@@ -637,71 +345,49 @@ def suggest_roles():
 
 @app.route('/api/role/<int:role_id>')
 def get_role_details(role_id):
-    """Get detailed role information"""
+    """Get detailed role information (revalidated with ETag)"""
     db = get_db()
-    role = db.execute('SELECT * FROM career_roles WHERE id = ?', (role_id,)).fetchone()
+    catalog = get_catalog(db)
+    role = catalog.get(role_id)
     
     if not role:
         return jsonify({'success': False, 'message': 'Role not found'}), 404
     
-    role_dict = dict(role)
-    db.close()
-    
-    return jsonify({
+    return conditional_json(f'role-{role_id}-v{catalog.version}', lambda: {
         'success': True,
-        'role': role_dict
-    })
+        'role': dict(role.row)
+    }, catalog.updated_at)
 
 @app.route('/api/roadmap/<int:role_id>')
 def get_roadmap(role_id):
-    """Get roadmap for a role"""
+    """Get roadmap for a role (revalidated with ETag / Last-Modified)"""
     db = get_db()
+    catalog = get_catalog(db)
     
-    # Get role
-    role = db.execute('SELECT * FROM career_roles WHERE id = ?', (role_id,)).fetchone()
-    
-    if not role:
+    if catalog.get(role_id) is None:
         return jsonify({'success': False, 'message': 'Role not found'}), 404
     
-    # Get phases
-    phases = db.execute('''
-        SELECT * FROM roadmap_phases 
-        WHERE role_id = ? 
-        ORDER BY phase_number
-    ''', (role_id,)).fetchall()
-    
-    roadmap = []
-    for phase in phases:
-        topics = db.execute('''
-            SELECT * FROM roadmap_topics 
-            WHERE phase_id = ? 
-            ORDER BY topic_order
-        ''', (phase['id'],)).fetchall()
-        
-        # Convert topics to dict and add MDN links
-        topics_list = []
-        for topic in topics:
-            topic_dict = dict(topic)
-            # If resource_link is null or empty, generate MDN link
-            if not topic_dict.get('resource_link'):
-                topic_dict['resource_link'] = get_mdn_link(topic_dict['topic_name'])
-            topics_list.append(topic_dict)
-        
-        roadmap.append({
-            'phase_number': phase['phase_number'],
-            'phase_name': phase['phase_name'],
-            'description': phase['phase_description'],
-            'duration': phase['estimated_duration'],
-            'topics': topics_list
-        })
+    return conditional_json(roadmap_etag(catalog, role_id),
+                            lambda: get_roadmap_document(catalog, role_id),
+                            catalog.updated_at)
+
+@app.route('/api/roadmap/<int:role_id>/bootstrap')
+def get_roadmap_with_progress(role_id):
+    """Roadmap plus the student's progress for roadmap.html, in one response"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Not logged in'}), 401
     
-    db.close()
+    user_id = session['user_id']
+    db = get_db()
+    catalog = get_catalog(db)
     
-    return jsonify({
-        'success': True,
-        'role': dict(role),
-        'roadmap': roadmap
-    })
+    if catalog.get(role_id) is None:
+        return jsonify({'success': False, 'message': 'Role not found'}), 404
+    
+    # The catalog version in the progress ETag covers the roadmap half
+    etag = 'roadmap-' + progress_etag(catalog, user_id, progress_version(db, user_id), role_id)
+    return conditional_json(etag, lambda: get_roadmap_bootstrap(
+        catalog, role_id, role_progress_state(db, user_id, role_id)))
 
 @app.route('/roles')
 def roles_page():
@@ -743,13 +429,11 @@ def enroll_in_role():
         return jsonify({'success': False, 'message': 'Role not found'}), 404
     
     # Create enrollment
-    cursor = db.execute(
-        'INSERT INTO student_enrollments (user_id, role_id) VALUES (?, ?)',
-        (user_id, role_id)
-    )
-    db.commit()
-    enrollment_id = cursor.lastrowid
-    db.close()
+    try:
+        enrollment_id = submit_write(enroll_student, user_id, role_id)
+    except sqlite3.IntegrityError:
+        # A concurrent request enrolled first
+        return jsonify({'success': False, 'message': 'Already enrolled in this role'}), 400
     
     return jsonify({
         'success': True,
@@ -759,59 +443,17 @@ def enroll_in_role():
 
 @app.route('/api/my-enrollments')
 def get_my_enrollments():
-    """Get current user's enrollments with progress"""
+    """Get current user's enrollments with progress (revalidated with ETag)"""
     if 'user_id' not in session:
         return jsonify({'success': False, 'message': 'Not logged in'}), 401
     
     user_id = session['user_id']
     db = get_db()
+    etag = progress_etag(get_catalog(db), user_id, progress_version(db, user_id))
     
-    enrollments = db.execute('''
-        SELECT e.id, e.role_id, e.enrolled_at, e.status, r.role_name, r.description
-        FROM student_enrollments e
-        JOIN career_roles r ON e.role_id = r.id
-        WHERE e.user_id = ?
-        ORDER BY e.enrolled_at DESC
-    ''', (user_id,)).fetchall()
-    
-    result = []
-    for enrollment in enrollments:
-        # Get total topics for this role
-        total_topics = db.execute('''
-            SELECT COUNT(*) as count
-            FROM roadmap_topics rt
-            JOIN roadmap_phases rp ON rt.phase_id = rp.id
-            WHERE rp.role_id = ?
-        ''', (enrollment['role_id'],)).fetchone()
-        
-        # Get completed topics
-        completed_topics = db.execute('''
-            SELECT COUNT(*) as count
-            FROM topic_progress
-            WHERE user_id = ? AND role_id = ? AND completed = 1
-        ''', (user_id, enrollment['role_id'])).fetchone()
-        
-        total = total_topics['count'] if total_topics else 0
-        completed = completed_topics['count'] if completed_topics else 0
-        progress = round((completed / total * 100) if total > 0 else 0, 1)
-        
-        result.append({
-            'id': enrollment['id'],
-            'role_id': enrollment['role_id'],
-            'role_name': enrollment['role_name'],
-            'description': enrollment['description'],
-            'enrolled_at': enrollment['enrolled_at'],
-            'status': enrollment['status'],
-            'progress_percentage': progress,
-            'completed_topics': completed,
-            'total_topics': total
-        })
-    
-    db.close()
-    
-    return jsonify({
+    return conditional_json(etag, lambda: {
         'success': True,
-        'enrollments': result
+        'enrollments': enrollments_with_progress(db, user_id)
     })
 
 @app.route('/api/progress/toggle', methods=['POST'])
@@ -829,94 +471,43 @@ def toggle_topic_progress():
     if not role_id or not topic_id:
         return jsonify({'success': False, 'message': 'Missing parameters'}), 400
     
-    db = get_db()
+    try:
+        role_id, topic_id = int(role_id), int(topic_id)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Invalid parameters'}), 400
     
-    # Check if progress record exists
-    existing = db.execute('''
-        SELECT * FROM topic_progress 
-        WHERE user_id = ? AND role_id = ? AND topic_id = ?
-    ''', (user_id, role_id, topic_id)).fetchone()
+    db = get_db()
+    if topic_id not in role_topic_ids(get_catalog(db), role_id):
+        return jsonify({'success': False, 'message': 'Topic is not on this roadmap'}), 400
     
-    if existing:
-        # Update existing record
-        db.execute('''
-            UPDATE topic_progress 
-            SET completed = ?, completed_at = CASE WHEN ? = 1 THEN CURRENT_TIMESTAMP ELSE NULL END
-            WHERE user_id = ? AND role_id = ? AND topic_id = ?
-        ''', (1 if completed else 0, 1 if completed else 0, user_id, role_id, topic_id))
-    else:
-        # Create new record
-        db.execute('''
-            INSERT INTO topic_progress (user_id, role_id, topic_id, completed, completed_at)
-            VALUES (?, ?, ?, ?, CASE WHEN ? = 1 THEN CURRENT_TIMESTAMP ELSE NULL END)
-        ''', (user_id, role_id, topic_id, 1 if completed else 0, 1 if completed else 0))
-    
-    db.commit()
-    
-    # Calculate new progress percentage
-    total_topics = db.execute('''
-        SELECT COUNT(*) as count
-        FROM roadmap_topics rt
-        JOIN roadmap_phases rp ON rt.phase_id = rp.id
-        WHERE rp.role_id = ?
-    ''', (role_id,)).fetchone()
-    
-    completed_topics = db.execute('''
-        SELECT COUNT(*) as count
-        FROM topic_progress
-        WHERE user_id = ? AND role_id = ? AND completed = 1
-    ''', (user_id, role_id)).fetchone()
-    
-    total = total_topics['count'] if total_topics else 0
-    completed_count = completed_topics['count'] if completed_topics else 0
-    progress = round((completed_count / total * 100) if total > 0 else 0, 1)
-    
-    db.close()
+    # Upsert the topic and adjust the enrollment's counter in one
+    # transaction, which also reads back the completed set
+    completed_ids = submit_write(apply_topic_completed, user_id, role_id, topic_id, completed)
+    state = progress_state(role_id, completed_ids, topic_total(db, role_id))
     
+    # The full completed set too, so the page never has to refetch it
     return jsonify({
         'success': True,
         'completed': completed,
-        'progress_percentage': progress,
-        'completed_topics': completed_count,
-        'total_topics': total
+        'progress_percentage': state['progress_percentage'],
+        'completed_topics': len(completed_ids),
+        'completed_topic_ids': completed_ids,
+        'total_topics': state['total_topics']
     })
 
 @app.route('/api/progress/<int:role_id>')
 def get_role_progress(role_id):
-    """Get progress for a specific role"""
+    """Get progress for a specific role (revalidated with ETag)"""
     if 'user_id' not in session:
         return jsonify({'success': False, 'message': 'Not logged in'}), 401
     
     user_id = session['user_id']
     db = get_db()
+    etag = progress_etag(get_catalog(db), user_id, progress_version(db, user_id), role_id)
     
-    # Get completed topic IDs
-    completed = db.execute('''
-        SELECT topic_id FROM topic_progress
-        WHERE user_id = ? AND role_id = ? AND completed = 1
-    ''', (user_id, role_id)).fetchall()
-    
-    completed_ids = [row['topic_id'] for row in completed]
-    
-    # Calculate progress
-    total_topics = db.execute('''
-        SELECT COUNT(*) as count
-        FROM roadmap_topics rt
-        JOIN roadmap_phases rp ON rt.phase_id = rp.id
-        WHERE rp.role_id = ?
-    ''', (role_id,)).fetchone()
-    
-    total = total_topics['count'] if total_topics else 0
-    progress = round((len(completed_ids) / total * 100) if total > 0 else 0, 1)
-    
-    db.close()
-    
-    return jsonify({
+    return conditional_json(etag, lambda: {
         'success': True,
-        'role_id': role_id,
-        'completed_topics': completed_ids,
-        'progress_percentage': progress,
-        'total_topics': total
+        **role_progress_state(db, user_id, role_id)
     })
 
 @app.route('/roadmap/<int:role_id>')
@@ -938,6 +529,47 @@ def get_specializations():
     ]
     return jsonify({'specializations': specializations})
 
+@app.route('/api/admin/reload-catalog', methods=['POST'])
+def reload_catalog():
+    """Make every worker recompile the catalog, without a restart"""
+    supplied = request.headers.get('Authorization', '')
+    if not CATALOG_ADMIN_TOKEN or not hmac.compare_digest(supplied.encode(),
+                                                          f'Bearer {CATALOG_ADMIN_TOKEN}'.encode()):
+        return jsonify({'success': False, 'message': 'Not found'}), 404
+    
+    # Other workers notice the new version on their next request; this
+    # one starts compiling right away
+    version = submit_write(bump_catalog_version)
+    schedule_reload(get_db())
+    return jsonify({'success': True, 'catalog_version': version}), 202
+
+@app.cli.command('reload-catalog')
+@click.argument('path', required=False)
+@click.option('--prune', is_flag=True, help='Delete phases and topics the file no longer lists.')
+def reload_catalog_command(path, prune):
+    """Import PATH (optional), then make running workers reload the catalog"""
+    conn = connect()
+    try:
+        migrate(conn)
+        if path:
+            stats = import_catalog(conn, read_catalog(path), prune=prune)
+            click.echo(f"Imported {path} in {stats.pop('seconds')}s")
+            for name, count in stats.items():
+                click.echo(f"   - {name.replace('_', ' ')}: {count}")
+        version = bump_catalog_version(conn)
+        conn.commit()
+    except CatalogError as e:
+        raise click.ClickException(str(e))
+    finally:
+        conn.close()
+    click.echo(f'Catalog version is now {version}; workers swap it in on their next request')
+
+@app.cli.command('rescore', context_settings={'ignore_unknown_options': True})
+@click.argument('args', nargs=-1, type=click.UNPROCESSED)
+def rescore_command(args):
+    """Recompute stored student recommendations (see rescore.py --help)"""
+    rescore_main(list(args))
+
 if __name__ == '__main__':
     print("\n" + "="*60)
     print(" Career Compass Platform Starting...")
@@ -951,6 +583,7 @@ import os
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
+    warm_up(app)
     app.run(host="0.0.0.0", port=port)
 
     
\ No newline at end of file
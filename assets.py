@@ -0,0 +1,352 @@
+"""
+Career Compass Platform - Static Assets
+Minified, fingerprinted and precompressed CSS/JS served with immutable caching
+
+    python assets.py    # build static/dist ahead of a deploy
+
+The app builds anything missing at startup; url_for('static', ...) then
+resolves each source file to its fingerprinted copy.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sys
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Source files under static/ that get a fingerprinted, compressed build
+ASSET_SOURCES = (
+    'css/style.css',
+    'js/main.js',
+    'js/roadmap.js',
+    'js/roles.js',
+)
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# (Content-Encoding, file suffix), most preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+
+# ==========================================
+# MINIFIERS
+# ==========================================
+
+_CSS_STRING_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+
+
+def minify_css(source):
+    """Drop comments and the whitespace around punctuation; strings are kept as is"""
+    parts = []
+    code = []
+    last = 0
+    for match in _CSS_STRING_OR_COMMENT.finditer(source):
+        code.append(source[last:match.start()])
+        if match.group(1):
+            parts.append(_squeeze_css(''.join(code)))
+            parts.append(match.group(1))
+            code = []
+        else:
+            code.append(' ')
+        last = match.end()
+    code.append(source[last:])
+    parts.append(_squeeze_css(''.join(code)))
+    return ''.join(parts).strip()
+
+
+def _squeeze_css(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r':\s+', ':', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    return text.replace(';}', '}')
+
+
+_JS_WORD = re.compile(r'[\w$\u0080-\uffff]')
+# After these (or a keyword below) a slash starts a regular expression
+_JS_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+_JS_REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void',
+                      'throw', 'delete', 'new', 'yield', 'await')
+# A line break next to these never changes how the script parses
+_JS_BREAK_AFTER = set('{;,([')
+_JS_BREAK_BEFORE = set('})];,')
+
+
+def minify_js(source):
+    """
+    Drop comments, indentation and blank lines. Strings, template literals
+    and regular expressions are copied untouched, and line breaks are kept
+    wherever automatic semicolon insertion could depend on them.
+    """
+    out = []
+    _JsScanner(source, out).code()
+    return ''.join(out).strip()
+
+
+class _JsScanner:
+    __slots__ = ('source', 'pos', 'out', 'pending')
+
+    def __init__(self, source, out):
+        self.source = source
+        self.pos = 0
+        self.out = out
+        self.pending = None  # whitespace seen since the last token: None, ' ' or '\n'
+
+    def _last(self):
+        return self.out[-1][-1] if self.out else ''
+
+    def emit(self, text):
+        if self.pending and self.out:
+            last, first = self._last(), text[0]
+            if self.pending == '\n':
+                if last not in _JS_BREAK_AFTER and first not in _JS_BREAK_BEFORE:
+                    self.out.append('\n')
+            elif ((_JS_WORD.match(last) and _JS_WORD.match(first))
+                  or (last in '+-/' and first in '+-/')):
+                self.out.append(' ')
+        self.pending = None
+        self.out.append(text)
+
+    def _regex_allowed(self):
+        last = self._last()
+        if not last or last in _JS_REGEX_AFTER:
+            return True
+        word = re.search(r'(?:^|[^\w$])([\w$]+)$', ''.join(self.out[-16:]))
+        return bool(word) and word.group(1) in _JS_REGEX_KEYWORDS
+
+    def _copy_until(self, quote):
+        """Copy a quoted run (the opening quote is at pos) through its close"""
+        src = self.source
+        end = self.pos + 1
+        while end < len(src) and src[end] != quote:
+            end += 2 if src[end] == '\\' else 1
+        self.emit(src[self.pos:end + 1])
+        self.pos = end + 1
+
+    def _copy_regex(self):
+        src = self.source
+        end = self.pos + 1
+        in_class = False
+        while end < len(src):
+            char = src[end]
+            if char == '\\':
+                end += 2
+                continue
+            if char == '[':
+                in_class = True
+            elif char == ']':
+                in_class = False
+            elif char == '/' and not in_class:
+                break
+            end += 1
+        self.emit(src[self.pos:end + 1])
+        self.pos = end + 1
+
+    def template(self):
+        """Copy a template literal, minifying the code inside ${...}"""
+        src = self.source
+        start = self.pos
+        self.pos += 1
+        while self.pos < len(src):
+            char = src[self.pos]
+            if char == '\\':
+                self.pos += 2
+            elif char == '`':
+                self.pos += 1
+                break
+            elif src.startswith('${', self.pos):
+                self.emit(src[start:self.pos + 2])
+                self.pos += 2
+                self.code(inside_template=True)
+                self.pending = None
+                self.out.append('}')
+                self.pos += 1
+                start = self.pos
+            else:
+                self.pos += 1
+        self.emit(src[start:self.pos])
+
+    def code(self, inside_template=False):
+        src = self.source
+        depth = 0
+        while self.pos < len(src):
+            char = src[self.pos]
+            if char.isspace():
+                if char == '\n' or self.pending == '\n':
+                    self.pending = '\n'
+                else:
+                    self.pending = ' '
+                self.pos += 1
+            elif src.startswith('//', self.pos):
+                end = src.find('\n', self.pos)
+                self.pos = len(src) if end < 0 else end
+            elif src.startswith('/*', self.pos):
+                end = src.find('*/', self.pos + 2)
+                end = len(src) if end < 0 else end + 2
+                self.pending = '\n' if '\n' in src[self.pos:end] else (self.pending or ' ')
+                self.pos = end
+            elif char in '\'"':
+                self._copy_until(char)
+            elif char == '`':
+                self.template()
+            elif char == '/' and self._regex_allowed():
+                self._copy_regex()
+            else:
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    if inside_template and depth == 0:
+                        return
+                    depth -= 1
+                self.emit(char)
+                self.pos += 1
+
+
+# ==========================================
+# BUILD
+# ==========================================
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def fingerprint(data):
+    return hashlib.blake2b(data, digest_size=6).hexdigest()
+
+
+def _write_atomic(path, data):
+    """Workers may build at once; readers only ever see complete files"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.unlink(temp)
+        raise
+
+
+def compress(data, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+def build_assets(static_folder=STATIC_FOLDER):
+    """
+    Minify, fingerprint and precompress ASSET_SOURCES into static/dist.
+    Files are named by content hash, so existing ones are left alone and
+    earlier builds stay valid for pages already out there.
+    Returns the manifest: {source path: {'path': built path, 'encodings': [...]}}.
+    """
+    manifest = {}
+    for source in ASSET_SOURCES:
+        source_path = os.path.join(static_folder, source)
+        if not os.path.exists(source_path):
+            continue
+        with open(source_path, 'rb') as f:
+            data = f.read()
+        base, ext = os.path.splitext(source)
+        minify = MINIFIERS.get(ext)
+        if minify:
+            data = minify(data.decode('utf-8')).encode('utf-8')
+
+        built = f'{DIST_DIR}/{base}.{fingerprint(data)}{ext}'
+        built_path = os.path.join(static_folder, built)
+        if not os.path.exists(built_path):
+            _write_atomic(built_path, data)
+
+        encodings = []
+        for encoding, suffix in ENCODINGS:
+            if encoding == 'br' and brotli is None:
+                continue
+            if not os.path.exists(built_path + suffix):
+                compressed = compress(data, encoding)
+                if len(compressed) >= len(data):
+                    continue
+                _write_atomic(built_path + suffix, compressed)
+            encodings.append(encoding)
+        manifest[source] = {'path': built, 'encodings': encodings}
+
+    _write_atomic(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME),
+                  json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+# ==========================================
+# FLASK INTEGRATION
+# ==========================================
+
+def init_app(app):
+    """
+    Build the assets, point url_for('static', ...) at the fingerprinted
+    files and serve those with a one-year immutable Cache-Control and the
+    best precompressed encoding the client accepts.
+    """
+    from flask import request, send_from_directory
+
+    try:
+        manifest = build_assets(app.static_folder)
+    except OSError as e:
+        # Read-only checkout without a prebuilt dist: serve the sources
+        app.logger.warning('Static assets not built (%s); serving sources', e)
+        manifest = {}
+    app.extensions['assets'] = manifest
+    built = {entry['path']: entry['encodings'] for entry in manifest.values()}
+
+    @app.url_defaults
+    def fingerprinted_url(endpoint, values):
+        if endpoint == 'static':
+            entry = manifest.get(values.get('filename'))
+            if entry:
+                values['filename'] = entry['path']
+
+    serve_static = app.view_functions['static']
+
+    def static(filename):
+        encodings = built.get(filename)
+        if encodings is None:
+            return serve_static(filename=filename)
+
+        mimetype = mimetypes.guess_type(filename)[0]
+        for encoding, suffix in ENCODINGS:
+            if encoding in encodings and request.accept_encodings[encoding]:
+                response = send_from_directory(app.static_folder, filename + suffix,
+                                               mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            response = send_from_directory(app.static_folder, filename,
+                                           mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    app.view_functions['static'] = static
+
+
+def main():
+    manifest = build_assets()
+    for source, entry in sorted(manifest.items()):
+        encodings = ', '.join(entry['encodings']) or 'uncompressed'
+        print(f"{source} -> {entry['path']} ({encodings})")
+    if brotli is None:
+        print("brotli is not installed; only gzip copies were written")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
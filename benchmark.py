@@ -0,0 +1,425 @@
+"""
+Career Compass Platform - Benchmarks
+Synthetic data, scoring micro-benchmarks and endpoint latency percentiles
+
+    python benchmark.py --students 2000 --roles 60 --topics 900 --output bench.json
+
+Everything runs against a generated database in a temporary directory;
+the real database is never touched. Compare the JSON files from two
+commits to spot regressions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# ==========================================
+# SYNTHETIC DATA
+# ==========================================
+
+# Rough popularity order: earlier skills are far more common in profiles
+SKILL_VOCABULARY = [
+    'Python', 'JavaScript', 'SQL', 'Git', 'Java', 'HTML', 'CSS', 'React', 'Linux',
+    'Machine Learning', 'Data Visualization', 'Statistics', 'Docker', 'AWS', 'Node.js',
+    'TypeScript', 'C++', 'Algorithms', 'Networking', 'Security', 'Excel', 'Figma',
+    'Kubernetes', 'Deep Learning', 'MongoDB', 'PostgreSQL', 'Azure', 'CI/CD', 'Go',
+    'Rust', 'TensorFlow', 'PyTorch', 'NLP', 'Computer Vision', 'Terraform', 'Kotlin',
+    'Swift', 'Flutter', 'Spark', 'Hadoop', 'Tableau', 'Power BI', 'Penetration Testing',
+    'Incident Response', 'Cybersecurity', 'Architecture', 'GCP', 'Vue.js', 'Next.js', 'C#',
+]
+# Alternative spellings students actually type
+SKILL_SPELLINGS = {
+    'JavaScript': ['JS', 'javascript'], 'Python': ['python3', 'Py'],
+    'Machine Learning': ['ML'], 'Kubernetes': ['k8s'], 'PostgreSQL': ['Postgres'],
+    'Node.js': ['NodeJS', 'node'], 'SQL': ['Advanced SQL', 'MySQL'],
+}
+SKILL_LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+SPECIALIZATIONS = ['Software Engineering', 'Data Science', 'AI-ML', 'Cloud Computing',
+                   'Cybersecurity', 'Web Development', 'Networking', 'CSE', 'IT']
+CATEGORIES = ['Software Engineering', 'AI/ML', 'Cloud', 'Security', 'Data', 'Design', 'Web']
+CAREER_GOALS = ['First Job', 'Career Switch', 'Higher Studies', 'Startup']
+TIMELINES = ['3 months', '6 months', '1 year', '2 years']
+TOPIC_SUFFIXES = ['Basics', 'Fundamentals', 'in Practice', 'Advanced Topics', 'Projects']
+
+
+def _zipf_choice(rng, items, count):
+    """count distinct items, skewed towards the front of the list"""
+    weights = [1 / (rank + 1) for rank in range(len(items))]
+    chosen = []
+    while len(chosen) < min(count, len(items)):
+        item = rng.choices(items, weights)[0]
+        if item not in chosen:
+            chosen.append(item)
+    return chosen
+
+
+def generate_database(path, students=1000, roles=60, topics=900, seed=42):
+    """
+    Build a complete database at path: roles with requirements and
+    roadmaps, students with preferences, enrollments and progress.
+    Returns a summary dict of what was generated.
+    """
+    from catalog import get_catalog, invalidate_catalog
+    from db import connect
+    from migrations import migrate
+    from profiles import save_skills_and_interests
+    from recommendations import refresh_stale_recommendations
+    from resources import fill_missing_links
+
+    rng = random.Random(seed)
+    conn = connect(path)
+    migrate(conn)
+
+    # Catalog
+    role_ids = []
+    for i in range(roles):
+        stack = _zipf_choice(rng, SKILL_VOCABULARY, rng.randint(4, 6))
+        specialization = rng.choice(SPECIALIZATIONS)
+        related = ','.join(rng.sample(SPECIALIZATIONS, 2))
+        entry_friendly = rng.random() < 0.6
+        cursor = conn.execute('''
+            INSERT INTO career_roles
+                (role_name, category, primary_specialization, related_specializations,
+                 description, avg_salary_range, avg_salary_numeric, demand_level,
+                 growth_rate, difficulty, entry_friendly, remote_friendly,
+                 experience_required, tech_stack, related_internships,
+                 transferable_skills, specialization_heavy)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (f'{stack[0]} Role {i + 1}', rng.choice(CATEGORIES), specialization, related,
+              f'Synthetic role built around {", ".join(stack)}', '60-120', rng.randint(50, 150) * 1000,
+              rng.choice(['Very High', 'High', 'Medium']), rng.choice(['Very Fast', 'Fast', 'Steady']),
+              rng.choice(['Beginner', 'Intermediate', 'Advanced']), int(entry_friendly),
+              int(rng.random() < 0.7), 'Some preferred' if entry_friendly else 'Required',
+              ','.join(stack), 'Intern', 1, int(rng.random() < 0.3)))
+        role_id = cursor.lastrowid
+        role_ids.append(role_id)
+        conn.executemany('''
+            INSERT INTO role_requirements (role_id, skill_name, skill_level, is_required, weight)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(role_id, skill, rng.choice(SKILL_LEVELS), int(position < 3), rng.randint(1, 3))
+              for position, skill in enumerate(stack)])
+
+    topic_ids = {role_id: [] for role_id in role_ids}
+    per_role = max(1, topics // max(1, roles))
+    for role_id in role_ids:
+        phases = 4
+        for phase_number in range(1, phases + 1):
+            phase_id = conn.execute('''
+                INSERT INTO roadmap_phases (role_id, phase_number, phase_name, phase_description, estimated_duration)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (role_id, phase_number, f'Phase {phase_number}', 'Synthetic phase', '2 months')).lastrowid
+            count = per_role // phases + (1 if phase_number <= per_role % phases else 0)
+            for order in range(1, count + 1):
+                name = f'{rng.choice(SKILL_VOCABULARY)} {rng.choice(TOPIC_SUFFIXES)}'
+                topic_id = conn.execute('''
+                    INSERT INTO roadmap_topics (phase_id, topic_name, topic_order, description)
+                    VALUES (?, ?, ?, ?)
+                ''', (phase_id, name, order, 'Synthetic topic')).lastrowid
+                topic_ids[role_id].append(topic_id)
+    fill_missing_links(conn)
+    conn.commit()
+
+    # Students
+    user_rows = []
+    for i in range(students):
+        skills = {}
+        for skill in _zipf_choice(rng, SKILL_VOCABULARY, rng.randint(2, 10)):
+            spelling = rng.choice([skill] + SKILL_SPELLINGS.get(skill, []))
+            skills[spelling] = rng.choices(SKILL_LEVELS, (3, 4, 2))[0]
+        user_rows.append((
+            f'Student {i + 1}', f'student{i + 1}@example.com', 'password', 'student',
+            rng.choice(SPECIALIZATIONS), rng.randint(1, 4),
+            skills, rng.sample(CATEGORIES, rng.randint(1, 3)),
+            rng.choice(CAREER_GOALS), rng.choice(TIMELINES),
+        ))
+    for row in user_rows:
+        skills, interests = row[6:8]
+        user_id = conn.execute('''
+            INSERT INTO users (name, email, password, user_type, specialization, current_year)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', row[:6]).lastrowid
+        conn.execute('''
+            INSERT INTO user_preferences (user_id, skills, interest_areas, career_goal, timeline)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (user_id, json.dumps(skills), json.dumps(interests), *row[8:]))
+        save_skills_and_interests(conn, user_id, skills, interests)
+
+        for role_id in rng.sample(role_ids, min(len(role_ids), rng.randint(0, 3))):
+            conn.execute('INSERT INTO student_enrollments (user_id, role_id) VALUES (?, ?)',
+                         (user_id, role_id))
+            done = rng.sample(topic_ids[role_id], rng.randint(0, len(topic_ids[role_id])))
+            conn.executemany('''
+                INSERT INTO topic_progress (user_id, role_id, topic_id, completed, completed_at)
+                VALUES (?, ?, ?, 1, CURRENT_TIMESTAMP)
+            ''', [(user_id, role_id, topic_id) for topic_id in done])
+    conn.execute('''
+        INSERT INTO enrollment_progress (user_id, role_id, completed_topics)
+        SELECT user_id, role_id, COUNT(*) FROM topic_progress
+        WHERE completed = 1 GROUP BY user_id, role_id
+    ''')
+    conn.execute('''
+        INSERT INTO users (name, email, password, user_type)
+        VALUES ('Parent', 'parent@example.com', 'password', 'parent')
+    ''')
+    conn.commit()
+    conn.execute('ANALYZE')
+
+    # Steady state: every saved profile has stored recommendations
+    invalidate_catalog()
+    refresh_stale_recommendations(conn, get_catalog(conn))
+    invalidate_catalog()
+    conn.close()
+
+    return {'students': students, 'roles': roles,
+            'topics': sum(len(ids) for ids in topic_ids.values()), 'seed': seed}
+
+
+# ==========================================
+# MEASUREMENT
+# ==========================================
+
+def summarize(samples):
+    """Latency summary in milliseconds"""
+    ordered = sorted(samples)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ordered[0]
+    return {
+        'runs': len(ordered),
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'p50_ms': p50 * 1000,
+        'p95_ms': p95 * 1000,
+        'p99_ms': p99 * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def measure(fn, runs, warmup=5, alloc_runs=20):
+    """
+    Time fn() over runs calls, then repeat a few calls under tracemalloc
+    (kept separate because tracing slows everything down).
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    result = summarize(samples)
+
+    alloc_runs = min(alloc_runs, runs)
+    if alloc_runs:
+        tracemalloc.start()
+        allocated = 0
+        peak = 0
+        for _ in range(alloc_runs):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            fn()
+            current, call_peak = tracemalloc.get_traced_memory()
+            allocated += max(0, current - before)
+            peak = max(peak, call_peak - before)
+        tracemalloc.stop()
+        result['retained_bytes_per_call'] = allocated // alloc_runs
+        result['peak_bytes_per_call'] = peak
+    return result
+
+
+# ==========================================
+# BENCHMARKS
+# ==========================================
+
+def micro_benchmarks(conn, runs):
+    from catalog import get_catalog
+    from profiles import load_profiles
+    from resources import get_mdn_link
+    from scoring import calculate_compatibility, score_many, top_roles
+
+    catalog = get_catalog(conn)
+    rows = conn.execute('''
+        SELECT u.id, u.name, u.specialization, u.current_year,
+               up.skills, up.interest_areas, up.career_goal, up.timeline
+        FROM users u JOIN user_preferences up ON up.user_id = u.id
+        LIMIT 500
+    ''').fetchall()
+    profiles = load_profiles(conn, rows)
+    topic_names = [row[0] for row in conn.execute('SELECT topic_name FROM roadmap_topics LIMIT 1000')]
+    cycle = {'i': 0}
+
+    def next_item(items):
+        cycle['i'] = (cycle['i'] + 1) % len(items)
+        return items[cycle['i']]
+
+    def score_one_profile():
+        profile = next_item(profiles)
+        for role in catalog:
+            calculate_compatibility(profile, role)
+
+    def resolve_link_uncached():
+        get_mdn_link.cache_clear()
+        get_mdn_link(next_item(topic_names))
+
+    return {
+        'calculate_compatibility (1 profile x all roles)': measure(score_one_profile, runs),
+        'top_roles (1 profile, top 10 with pruning)': measure(
+            lambda: top_roles(next_item(profiles), catalog, 10), runs),
+        'score_many (500 profiles x all roles)': measure(lambda: score_many(profiles, catalog),
+                                                         max(5, runs // 20)),
+        'get_mdn_link (uncached)': measure(resolve_link_uncached, runs),
+        'get_mdn_link (cached)': measure(lambda: get_mdn_link(topic_names[0]), runs),
+        'profile JSON decode': measure(
+            lambda: (lambda row: (json.loads(row['skills']), json.loads(row['interest_areas'])))(next_item(rows)),
+            runs),
+        'load_profiles (500 students, normalized)': measure(lambda: load_profiles(conn, rows),
+                                                            max(5, runs // 20)),
+    }
+
+
+def endpoint_benchmarks(app, conn, runs):
+    rng = random.Random(7)
+    student = conn.execute('''
+        SELECT u.id, u.email FROM users u
+        JOIN student_enrollments e ON e.user_id = u.id
+        WHERE u.user_type = 'student' LIMIT 1
+    ''').fetchone()
+    enrollment = conn.execute('SELECT role_id FROM student_enrollments WHERE user_id = ? LIMIT 1',
+                              (student['id'],)).fetchone()
+    role_ids = [row[0] for row in conn.execute('SELECT id FROM career_roles')]
+    topics = [row[0] for row in conn.execute('''
+        SELECT rt.id FROM roadmap_topics rt JOIN roadmap_phases rp ON rt.phase_id = rp.id
+        WHERE rp.role_id = ?
+    ''', (enrollment['role_id'],))]
+
+    def random_profile():
+        skills = {skill: rng.choice(SKILL_LEVELS)
+                  for skill in _zipf_choice(rng, SKILL_VOCABULARY, rng.randint(2, 8))}
+        return {'name': 'Bench', 'specialization': rng.choice(SPECIALIZATIONS), 'skills': skills,
+                'interest_areas': rng.sample(CATEGORIES, 2), 'career_goal': rng.choice(CAREER_GOALS),
+                'timeline': rng.choice(TIMELINES), 'current_year': rng.randint(1, 4)}
+
+    repeated_profile = random_profile()
+
+    def request(client, method, url, **kwargs):
+        def call():
+            response = client.open(url, method=method, **kwargs)
+            response.get_data()  # drain streamed bodies
+            assert response.status_code < 400, (url, response.status_code)
+            response.close()
+        return call
+
+    student_client = app.test_client()
+    student_client.post('/login', data={'action': 'login', 'email': student['email'],
+                                        'password': 'password', 'user_type': 'student'})
+    anonymous = app.test_client()
+    parent_client = app.test_client()
+    parent_client.post('/login', data={'action': 'login', 'email': 'parent@example.com',
+                                       'password': 'password', 'user_type': 'parent'})
+
+    def toggle():
+        response = student_client.post('/api/progress/toggle', json={
+            'role_id': enrollment['role_id'], 'topic_id': rng.choice(topics),
+            'completed': rng.random() < 0.5})
+        assert response.status_code == 200
+
+    # A signed-in non-student: suggestions are scored but never saved
+    with anonymous.session_transaction() as session:
+        session['user_id'] = -1
+        session['user_type'] = 'guest'
+
+    dashboard_runs = max(3, runs // 20)
+    return {
+        'POST /api/suggest-roles (new profiles)': measure(
+            lambda: request(anonymous, 'POST', '/api/suggest-roles', json=random_profile())(), runs),
+        'POST /api/suggest-roles (repeated profile)': measure(
+            request(anonymous, 'POST', '/api/suggest-roles', json=repeated_profile), runs),
+        'GET /api/roadmap/<id>': measure(
+            lambda: request(student_client, 'GET', f'/api/roadmap/{rng.choice(role_ids)}')(), runs),
+        'GET /api/my-enrollments': measure(
+            request(student_client, 'GET', '/api/my-enrollments'), runs),
+        'POST /api/progress/toggle': measure(toggle, runs),
+        'GET /student-dashboard': measure(
+            request(student_client, 'GET', '/student-dashboard'), runs),
+        'GET /dashboard (all students)': measure(
+            request(parent_client, 'GET', '/dashboard'), dashboard_runs, warmup=1, alloc_runs=3),
+        'GET /api/dashboard/students': measure(
+            request(parent_client, 'GET', '/api/dashboard/students?limit=50'), runs),
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark scoring and the hot endpoints.')
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--roles', type=int, default=60)
+    parser.add_argument('--topics', type=int, default=900)
+    parser.add_argument('--runs', type=int, default=200, help='timed calls per benchmark')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='career-compass-bench-') as workdir:
+        path = os.path.join(workdir, 'career_compass.db')
+        # Point every module at the generated database before the app loads
+        os.environ['DATABASE_PATH'] = path
+        import db
+        db.DATABASE_PATH = path
+
+        started = time.perf_counter()
+        dataset = generate_database(path, args.students, args.roles, args.topics, args.seed)
+        dataset['generate_seconds'] = time.perf_counter() - started
+        print(f"Generated {dataset['students']} students, {dataset['roles']} roles, "
+              f"{dataset['topics']} topics in {dataset['generate_seconds']:.1f}s")
+
+        from app import app
+        app.testing = True
+
+        conn = db.connect(path)
+        try:
+            with app.app_context():
+                results = {
+                    'revision': _git_revision(),
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'dataset': dataset,
+                    'runs': args.runs,
+                    'micro': micro_benchmarks(conn, args.runs),
+                }
+            results['endpoints'] = endpoint_benchmarks(app, conn, args.runs)
+        finally:
+            conn.close()
+
+    for group in ('micro', 'endpoints'):
+        print(f"\n{group}")
+        for name, stats in results[group].items():
+            print(f"  {name:<52} p50 {stats['p50_ms']:8.3f} ms   p95 {stats['p95_ms']:8.3f} ms"
+                  f"   p99 {stats['p99_ms']:8.3f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""
+Career Compass Platform - Compiled Role Catalog
+Roles are loaded once per process and pre-parsed for the scoring engine
+
+    CATALOG_RELOAD_RETRY=5   seconds before a failed background reload is retried
+
+Each process serves one immutable snapshot at a time. When the stored
+catalog version moves on, a background thread compiles the next snapshot
+and swaps it in with one reference assignment: requests never wait for a
+rebuild and never see a half-built catalog.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from db import connect
+from resources import RESOURCE_LINKS_PATH, ResourceLinkResolver, use_resolver
+from roadmaps import build_roadmaps
+from skills import SkillIndex
+
+# Bonus / penalty constants used by the scoring engine
+DEMAND_BONUS = 3
+GROWTH_BONUS = 2
+REMOTE_BONUS = 2
+EARLY_CAREER_BONUS = 3
+EXPERIENCE_PENALTY = 3
+
+# Points shared out over a role's skills in proportion to their weights
+SKILL_POINTS = 45
+
+FAST_GROWTH_RATES = ('Fast', 'Very Fast')
+
+
+class CompiledRole:
+    """
+    A career role with every string the scoring engine needs already split
+    and canonicalized, plus the role-only parts of the score.
+    """
+
+    __slots__ = (
+        'id', 'name', 'row', 'category', 'primary_specialization',
+        'related_specializations', 'requirements', 'skill_index',
+        'entry_friendly', 'difficulty', 'timeline_points',
+        'fixed_bonus', 'fixed_bonus_list', 'fixed_penalty', 'fixed_penalty_list',
+    )
+
+    def __init__(self, row, skill_index=None, requirements=None):
+        self.row = row
+        self.id = row.get('id')
+        self.name = row.get('role_name')
+        self.category = row.get('category') or ''
+        self.primary_specialization = row.get('primary_specialization')
+        self.related_specializations = frozenset((row.get('related_specializations') or '').split(','))
+
+        # (display name, canonical key, points, required level, is required)
+        # per skill, from role_requirements when the role has any and from
+        # the tech stack (equal weight, any level, all required) otherwise
+        if requirements:
+            skills = [((req.get('skill_name') or '').strip(),
+                       max(req.get('weight') if req.get('weight') is not None else 1, 0),
+                       req.get('skill_level') or None,
+                       bool(req.get('is_required', 1)))
+                      for req in requirements]
+            skills = [skill for skill in skills if skill[0]]
+        else:
+            skills = [(skill, 1, None, True) for skill in split_tech_stack(row.get('tech_stack'))]
+        if skill_index is None:
+            skill_index = SkillIndex(skill[0] for skill in skills)
+        self.skill_index = skill_index
+        total_weight = sum(weight for _, weight, _, _ in skills)
+        self.requirements = tuple(
+            (skill, skill_index.canonical(skill),
+             SKILL_POINTS * weight / total_weight if total_weight else 0.0,
+             level, required)
+            for skill, weight, level, required in skills)
+
+        self.entry_friendly = bool(row.get('entry_friendly'))
+        self.difficulty = row.get('difficulty')
+
+        # Goal points per timeline (anything else scores 1)
+        self.timeline_points = {
+            '3 months': 2 if self.difficulty == 'Beginner' else 1,
+            '6 months': 2 if self.difficulty in ('Beginner', 'Intermediate') else 1,
+        }
+
+        bonus = 0
+        bonuses = []
+        if row.get('demand_level') == 'Very High':
+            bonus += DEMAND_BONUS
+            bonuses.append(f"🔥 Very high market demand (+{DEMAND_BONUS})")
+        if row.get('growth_rate') in FAST_GROWTH_RATES:
+            bonus += GROWTH_BONUS
+            bonuses.append(f"🚀 Fast growing field (+{GROWTH_BONUS})")
+        if row.get('remote_friendly'):
+            bonus += REMOTE_BONUS
+            bonuses.append(f"🏢 Remote work friendly (+{REMOTE_BONUS})")
+        self.fixed_bonus = bonus
+        self.fixed_bonus_list = tuple(bonuses)
+
+        if not self.entry_friendly and row.get('experience_required') == 'Required':
+            self.fixed_penalty = EXPERIENCE_PENALTY
+            self.fixed_penalty_list = (f"⚠️ Experience preferred (-{EXPERIENCE_PENALTY})",)
+        else:
+            self.fixed_penalty = 0
+            self.fixed_penalty_list = ()
+
+    def __repr__(self):
+        return f"CompiledRole({self.id!r}, {self.name!r})"
+
+
+def split_tech_stack(tech_stack):
+    return [skill.strip() for skill in (tech_stack or '').split(',') if skill.strip()]
+
+
+def compile_role(role):
+    """Compile a single career_roles row (sqlite3.Row or dict)"""
+    if isinstance(role, CompiledRole):
+        return role
+    return CompiledRole(dict(role))
+
+
+class RoleCatalog:
+    """
+    Immutable snapshot of the catalog tables: compiled roles, their
+    roadmaps and the link table used for them (plus derived data)
+    """
+
+    def __init__(self, roles, version, skill_index=None, roadmaps=None, links=None,
+                 scoring_version=None):
+        self.roles = tuple(roles)
+        self.skill_index = skill_index
+        self.by_id = {role.id: role for role in self.roles}
+        self.version = version
+        # Moves only with the tables scores are computed from
+        self.scoring_version = version if scoring_version is None else scoring_version
+        self.updated_at = None
+        self.roadmaps = roadmaps if roadmaps is not None else {}
+        self.links = links
+        # Structures derived from this snapshot (e.g. scoring matrices)
+        self.derived = {}
+
+    def __iter__(self):
+        return iter(self.roles)
+
+    def __len__(self):
+        return len(self.roles)
+
+    def get(self, role_id):
+        return self.by_id.get(role_id)
+
+
+# ==========================================
+# VERSIONING
+# ==========================================
+
+# Tables whose contents make up the catalog (roles and their roadmaps); a
+# trigger on each bumps catalog_version (see migrations.py) so every process
+# can tell its compiled copy is stale with one lookup
+CATALOG_TABLES = ('career_roles', 'role_requirements', 'roadmap_phases', 'roadmap_topics')
+
+# The subset scores are computed from; their triggers also bump
+# scoring_version, which stored recommendations and the suggestion cache
+# are keyed on, so a roadmap edit leaves them valid
+SCORING_TABLES = ('career_roles', 'role_requirements')
+
+
+def get_catalog_version(conn):
+    row = conn.execute('SELECT version FROM catalog_version WHERE id = 1').fetchone()
+    return row[0] if row else 0
+
+
+def get_scoring_version(conn):
+    row = conn.execute('SELECT scoring_version FROM catalog_version WHERE id = 1').fetchone()
+    return row[0] if row else 0
+
+
+def bump_catalog_version(conn, scoring=False):
+    """
+    Mark the catalog as changed so every process reloads it (with scoring,
+    stored recommendations go stale too); the caller commits
+    """
+    conn.execute(f'''
+        UPDATE catalog_version
+        SET version = version + 1, {'scoring_version = scoring_version + 1, ' if scoring else ''}
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = 1
+    ''')
+    return get_catalog_version(conn)
+
+
+def get_catalog_updated_at(conn):
+    """When the catalog last changed, as a UTC datetime (None if unknown)"""
+    row = conn.execute('SELECT updated_at FROM catalog_version WHERE id = 1').fetchone()
+    if not row or not row[0]:
+        return None
+    return datetime.strptime(row[0], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+
+
+# ==========================================
+# PROCESS-WIDE CACHE
+# ==========================================
+
+CATALOG_RELOAD_RETRY = float(os.environ.get('CATALOG_RELOAD_RETRY', 5))
+
+logger = logging.getLogger(__name__)
+
+_catalog = None
+_catalog_lock = threading.Lock()
+_reload_thread = None
+_reload_retry_at = 0.0
+
+
+def load_catalog(conn, with_roadmaps=True):
+    """
+    Read and compile every career role and, unless with_roadmaps is
+    false, every roadmap (missing links resolved with a freshly read link
+    table), all from one consistent read of the database
+    """
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute('BEGIN')
+    try:
+        version = get_catalog_version(conn)
+        scoring_version = get_scoring_version(conn)
+        updated_at = get_catalog_updated_at(conn)
+        rows = [dict(row) for row in conn.execute('SELECT * FROM career_roles ORDER BY id')]
+
+        requirements = {}
+        for req in conn.execute('''
+            SELECT role_id, skill_name, skill_level, is_required, weight
+            FROM role_requirements
+            WHERE skill_name IS NOT NULL
+            ORDER BY role_id, id
+        '''):
+            requirements.setdefault(req['role_id'], []).append(dict(req))
+
+        links = roadmaps = None
+        if with_roadmaps:
+            links = ResourceLinkResolver.from_file(RESOURCE_LINKS_PATH)
+            roadmaps = build_roadmaps(conn, links.resolve)
+    finally:
+        if own_transaction:
+            conn.commit()
+
+    # One skill index shared by every role, built from all known skill names
+    skill_names = [skill for row in rows for skill in split_tech_stack(row.get('tech_stack'))]
+    skill_names += [req['skill_name'] for reqs in requirements.values() for req in reqs]
+    skill_index = SkillIndex(skill_names)
+
+    catalog = RoleCatalog((CompiledRole(row, skill_index, requirements.get(row['id']))
+                           for row in rows), version, skill_index, roadmaps, links,
+                          scoring_version)
+    catalog.updated_at = updated_at
+    if roadmaps is not None:
+        catalog.derived['topic_totals'] = {
+            role_id: sum(len(phase['topics']) for phase in phases)
+            for role_id, phases in roadmaps.items()
+        }
+    return catalog
+
+
+def warm_catalog(catalog):
+    """Build (and freeze) what the first scoring request would otherwise build"""
+    from scoring import encode_roles
+    encode_roles(catalog).freeze()
+
+
+def _install(catalog):
+    """Swap in a new snapshot (caller holds _catalog_lock)"""
+    global _catalog
+    _catalog = catalog
+    if catalog.links is not None:
+        use_resolver(catalog.links)
+
+
+def get_catalog(conn):
+    """
+    Return the current compiled catalog. Only a process's first call
+    waits for a compile; after that a stale catalog keeps being served
+    while schedule_reload builds its replacement.
+    """
+    catalog = _catalog
+    if catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _install(load_catalog(conn))
+            return _catalog
+
+    if catalog.version != get_catalog_version(conn):
+        schedule_reload(conn)
+    return catalog
+
+
+def schedule_reload(conn):
+    """
+    Compile the catalog again on a background thread and swap it in when
+    done; at most one reload runs per process. An in-memory database has
+    nothing another connection could read, so it reloads in place.
+    """
+    global _reload_thread
+
+    thread = _reload_thread
+    if thread is not None and thread.is_alive():
+        return
+    path = conn.execute('PRAGMA database_list').fetchone()[2]
+    with _catalog_lock:
+        if not path:
+            _install(load_catalog(conn))
+            return
+        thread = _reload_thread
+        if (thread is not None and thread.is_alive()) or time.monotonic() < _reload_retry_at:
+            return
+        _reload_thread = threading.Thread(target=_reload, args=(path,), name='catalog-reload',
+                                          daemon=True)
+        _reload_thread.start()
+
+
+def _reload(path):
+    global _reload_retry_at
+    try:
+        conn = connect(path)
+        try:
+            catalog = load_catalog(conn)
+        finally:
+            conn.close()
+        warm_catalog(catalog)
+    except Exception:
+        logger.exception('Catalog reload failed; retrying in %.0fs', CATALOG_RELOAD_RETRY)
+        with _catalog_lock:
+            _reload_retry_at = time.monotonic() + CATALOG_RELOAD_RETRY
+        return
+
+    with _catalog_lock:
+        if _catalog is None or _catalog.version != catalog.version:
+            _install(catalog)
+
+
+def invalidate_catalog():
+    """Drop the compiled catalog so the next call compiles it again"""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
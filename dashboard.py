@@ -0,0 +1,142 @@
+"""
+Career Compass Platform - Parent Dashboard
+Keyset-paginated, filterable student listing read chunk by chunk
+"""
+
+from itertools import islice
+
+from metrics import timed
+from profiles import canonical_skill, load_profiles
+from recommendations import load_recommendations
+from scoring import score_many, top_k
+
+DASHBOARD_PAGE_SIZE = 20
+DASHBOARD_MAX_PAGE_SIZE = 100
+DASHBOARD_CHUNK_SIZE = 200
+DASHBOARD_TOP_ROLES = 3
+
+# Students without saved preferences have nothing to show and are skipped
+DASHBOARD_QUERY = '''
+    SELECT u.id, u.name, u.email, u.specialization, u.current_year,
+           up.career_goal, up.timeline
+    FROM users u
+    JOIN user_preferences up ON up.user_id = u.id
+    WHERE u.user_type = 'student' AND u.id > ?
+      AND up.skills IS NOT NULL AND up.skills != ''
+'''
+
+
+def _int_arg(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def dashboard_filters(args):
+    """Filters from query-string args; blank or malformed values are ignored"""
+    return {
+        'specialization': (args.get('specialization') or '').strip() or None,
+        'year': _int_arg(args.get('year')),
+        'top_role': (args.get('top_role') or '').strip() or None,
+        'min_score': _int_arg(args.get('min_score')),
+        'skill': (args.get('skill') or '').strip() or None,
+        'skill_level': (args.get('skill_level') or '').strip() or None,
+    }
+
+
+def page_size(value):
+    size = _int_arg(value) or DASHBOARD_PAGE_SIZE
+    return max(1, min(size, DASHBOARD_MAX_PAGE_SIZE))
+
+
+def iter_students(conn, catalog, filters=None, child_email=None, after=0,
+                  chunk_size=DASHBOARD_CHUNK_SIZE):
+    """
+    Yield dashboard entries in student id order, reading at most
+    chunk_size students at a time. Top roles come from the stored
+    recommendations; students without fresh ones are scored on the spot.
+    Specialization, year, skill and child email filter in SQL; top role
+    and minimum score filter on the top roles.
+    """
+    filters = filters or {}
+    query = DASHBOARD_QUERY
+    params = []
+    if child_email:
+        query += ' AND u.email = ?'
+        params.append(child_email)
+    if filters.get('specialization'):
+        query += ' AND u.specialization = ?'
+        params.append(filters['specialization'])
+    if filters.get('year') is not None:
+        query += ' AND u.current_year = ?'
+        params.append(filters['year'])
+    if filters.get('skill'):
+        # Any spelling of the skill, e.g. ?skill=python&skill_level=Advanced
+        query += '''
+            AND EXISTS (SELECT 1 FROM user_skills us JOIN skills s ON s.id = us.skill_id
+                        WHERE us.user_id = u.id AND s.canonical_key = ?'''
+        params.append(canonical_skill(filters['skill']))
+        if filters.get('skill_level'):
+            query += ' AND us.level = ?'
+            params.append(filters['skill_level'])
+        query += ')'
+    query += ' ORDER BY u.id LIMIT ?'
+
+    top_role = (filters.get('top_role') or '').lower()
+    min_score = filters.get('min_score')
+
+    cursor = after or 0
+    while True:
+        rows = conn.execute(query, (cursor, *params, chunk_size)).fetchall()
+        if not rows:
+            return
+        cursor = rows[-1]['id']
+
+        # Stored recommendations where fresh; the rest are scored in one batch
+        stored = load_recommendations(conn, [row['id'] for row in rows], catalog.scoring_version,
+                                      limit=DASHBOARD_TOP_ROLES)
+        profiles = load_profiles(conn, rows)
+        stale = [i for i, row in enumerate(rows) if row['id'] not in stored]
+        if stale:
+            with timed('scoring'):
+                scores = score_many([profiles[i] for i in stale], catalog)
+                best = top_k(scores, DASHBOARD_TOP_ROLES)
+            for n, i in enumerate(stale):
+                stored[rows[i]['id']] = [{'role_id': catalog.roles[j].id, 'score': int(scores[n, j])}
+                                         for j in best[n]]
+
+        for student, profile in zip(rows, profiles):
+            roles = [{'name': catalog.get(entry['role_id']).name, 'score': entry['score']}
+                     for entry in stored[student['id']]]
+            if top_role and (not roles or roles[0]['name'].lower() != top_role):
+                continue
+            if min_score is not None and (not roles or roles[0]['score'] < min_score):
+                continue
+            yield {
+                'id': student['id'],
+                'name': student['name'],
+                'email': student['email'],
+                'career_goal': student['career_goal'],
+                'current_year': student['current_year'],
+                'specialization': student['specialization'],
+                'roles': roles,
+                'skills': list(profile['skills'].keys()),
+                'interests': profile['interest_areas']
+            }
+
+        if len(rows) < chunk_size:
+            return
+
+
+def students_page(conn, catalog, filters=None, child_email=None, after=0,
+                  limit=DASHBOARD_PAGE_SIZE):
+    """
+    One page of dashboard entries after the given student id.
+    Returns (students, next_after); next_after is None on the last page.
+    """
+    students = list(islice(
+        iter_students(conn, catalog, filters, child_email, after, chunk_size=limit),
+        limit))
+    next_after = students[-1]['id'] if len(students) == limit else None
+    return students, next_after
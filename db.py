@@ -0,0 +1,164 @@
+"""
+Career Compass Platform - Database Connections
+Bounded per-worker SQLite connection pool tied to Flask's app context
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from flask import g
+
+from metrics import connection_factory
+
+DATABASE_PATH = os.environ.get('DATABASE_PATH', os.path.join('database', 'career_compass.db'))
+
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+BUSY_TIMEOUT = 5.0
+STATEMENT_CACHE_SIZE = 256
+
+# Applied once when a connection is opened
+PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -16000',    # 16 MB page cache
+    'PRAGMA mmap_size = 268435456',  # 256 MB memory-mapped I/O
+    'PRAGMA temp_store = MEMORY',
+)
+
+
+class PoolTimeout(RuntimeError):
+    """No pooled connection became free within POOL_TIMEOUT seconds"""
+
+
+def connect(path=None):
+    """Open a tuned connection (also used directly by scripts)"""
+    conn = sqlite3.connect(path or DATABASE_PATH, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE_SIZE, factory=connection_factory())
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """
+    At most `size` connections per worker process. Idle connections are
+    reused most-recently-released first so their page caches stay warm.
+    """
+
+    def __init__(self, path=None, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.path = path or DATABASE_PATH
+        self.size = size
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+            with self._lock:
+                self.hits += 1
+            return conn
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+                self.misses += 1
+        if can_open:
+            try:
+                return connect(self.path)
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        # Pool exhausted: wait for another request to release a connection
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeout(f'No database connection free after {self.timeout}s')
+        finally:
+            with self._lock:
+                self.waits += 1
+                self.wait_time += time.perf_counter() - started
+        return conn
+
+    def release(self, conn):
+        try:
+            # Anything the request did not commit is discarded
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self.discard(conn)
+            return
+        self._idle.put(conn)
+
+    def discard(self, conn):
+        try:
+            conn.close()
+        finally:
+            with self._lock:
+                self._opened -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': self._opened,
+                'idle': self._idle.qsize(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'wait_time': self.wait_time,
+                'timeouts': self.timeouts,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The pool for this worker (a forked worker never reuses its parent's)"""
+    global _pool
+    pool = _pool
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = ConnectionPool()
+        return _pool
+
+
+def get_db():
+    """Connection for the current request, released at app-context teardown"""
+    if 'db' not in g:
+        g.db = get_pool().acquire()
+    return g.db
+
+
+def close_db(exc=None):
+    conn = g.pop('db', None)
+    if conn is not None:
+        get_pool().release(conn)
+
+
+def init_app(app):
+    app.teardown_appcontext(close_db)
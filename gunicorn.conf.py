@@ -0,0 +1,41 @@
+"""
+Career Compass Platform - Gunicorn Settings
+Picked up automatically by `gunicorn app:app` (see Procfile)
+
+    WEB_CONCURRENCY=2    worker processes (gunicorn's own setting)
+
+The app is imported once, in the master, and warmed up there (startup.py)
+before any worker exists; workers are forked from it ready to serve and
+share the warmed-up heap.
+"""
+
+import gc
+
+preload_app = True
+
+# No collections while the master imports and warms up the app: startup.py
+# freezes everything built by then, and a collection before that would only
+# punch holes into pages the workers are about to share. when_ready and
+# post_worker_init switch collection back on.
+if preload_app:
+    gc.disable()
+
+
+def when_ready(server):
+    # Called in the master once it listens, before the first fork
+    try:
+        if server.cfg.preload_app:
+            from startup import ensure_warm
+            ensure_warm(server.app.wsgi())
+    finally:
+        # Collect as usual from here on, in the master and the workers it forks
+        gc.enable()
+
+
+def post_worker_init(worker):
+    # Never serve without collection, whatever happened in the master
+    gc.enable()
+    # Without preload_app each worker imports the app on its own; warm it
+    # before it accepts requests (a no-op for workers forked warm)
+    from startup import ensure_warm
+    ensure_warm(worker.wsgi)
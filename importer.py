@@ -0,0 +1,567 @@
+"""
+Career Compass Platform - Catalog Importer
+Bulk-load roles, requirements and roadmaps from JSON, YAML or CSV files
+
+    python importer.py data/catalog.json          # insert new roles, update changed ones
+    python importer.py catalog/ --skip-existing   # CSV directory; leave existing roles alone
+    python importer.py changed.yaml --prune       # also drop topics the file no longer lists
+
+Roles are matched by role_name, phases by (role, phase_number) and topics
+by (phase, topic_name), so re-importing keeps the ids that enrollments and
+progress point at, and rows that did not change are not written at all.
+Roles missing from the file are left alone, so a file holding only the
+changed roles is a valid incremental import. Requirements are replaced
+per role; phases and topics are upserted, and with --prune the ones a
+role no longer lists are removed (unless students have progress on
+them). User tables are never touched.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from operator import itemgetter
+
+try:
+    import yaml
+except ImportError:  # optional: JSON and CSV only
+    yaml = None
+
+from catalog import CATALOG_TABLES, bump_catalog_version
+from db import DATABASE_PATH, connect
+from resources import get_mdn_link
+
+# Loads writing this many rows drop the catalog's secondary indexes and
+# version triggers, and rebuild them once at the end
+DEFER_INDEXES_MIN_ROWS = 50000
+
+SKILL_LEVELS = ('Beginner', 'Intermediate', 'Advanced')
+
+# CSV layout: one file per table, rows tied together by role_name
+# (and phase_number for topics)
+CSV_FILES = ('roles.csv', 'requirements.csv', 'phases.csv', 'topics.csv')
+
+
+class CatalogError(ValueError):
+    """The catalog file is malformed; .problems lists every issue found"""
+
+    def __init__(self, problems):
+        self.problems = problems
+        shown = '\n  '.join(problems[:20])
+        more = f'\n  ... and {len(problems) - 20} more' if len(problems) > 20 else ''
+        super().__init__(f'{len(problems)} problem(s) in catalog:\n  {shown}{more}')
+
+
+# ==========================================
+# SCHEMA
+# ==========================================
+
+def _text(value):
+    if isinstance(value, (list, tuple)):
+        return ','.join(str(item).strip() for item in value)
+    return str(value)
+
+
+def _integer(value):
+    if isinstance(value, bool):
+        raise ValueError
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError
+    return int(value)
+
+
+def _number(value):
+    if isinstance(value, bool):
+        raise ValueError
+    number = float(value)
+    if number < 0:
+        raise ValueError
+    return int(number) if number.is_integer() else number
+
+
+def _flag(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return int(value)
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes', 'y'):
+        return 1
+    if text in ('0', 'false', 'no', 'n'):
+        return 0
+    raise ValueError
+
+
+def _skill_level(value):
+    if value not in SKILL_LEVELS:
+        raise ValueError
+    return value
+
+
+# column -> (converter, default); None defaults to NULL, required columns use ...
+ROLE_COLUMNS = {
+    'role_name': (_text, ...),
+    'category': (_text, None),
+    'primary_specialization': (_text, None),
+    'related_specializations': (_text, None),
+    'description': (_text, None),
+    'avg_salary_range': (_text, None),
+    'avg_salary_numeric': (_integer, None),
+    'demand_level': (_text, None),
+    'growth_rate': (_text, None),
+    'difficulty': (_text, None),
+    'entry_friendly': (_flag, None),
+    'remote_friendly': (_flag, None),
+    'experience_required': (_text, None),
+    'tech_stack': (_text, None),
+    'related_internships': (_text, None),
+    'transferable_skills': (_flag, 1),
+    'specialization_heavy': (_flag, 0),
+}
+
+REQUIREMENT_COLUMNS = {
+    'skill_name': (_text, ...),
+    'skill_level': (_skill_level, None),
+    'is_required': (_flag, 1),
+    'weight': (_number, 1),
+}
+
+PHASE_COLUMNS = {
+    'phase_number': (_integer, None),  # defaults to the phase's position
+    'phase_name': (_text, ...),
+    'phase_description': (_text, None),
+    'estimated_duration': (_text, None),
+}
+
+TOPIC_COLUMNS = {
+    'topic_name': (_text, ...),
+    'topic_order': (_integer, None),  # defaults to the topic's position
+    'description': (_text, None),
+    'resource_link': (_text, None),  # resolved from the topic name when empty
+    'resource_type': (_text, None),
+    'is_essential': (_flag, 1),
+    'is_checkpoint': (_flag, 0),
+}
+
+# (column, converter, default) triples, walked once per record
+_ROLE_SPEC, _REQUIREMENT_SPEC, _PHASE_SPEC, _TOPIC_SPEC = (
+    tuple((column, *rule) for column, rule in columns.items())
+    for columns in (ROLE_COLUMNS, REQUIREMENT_COLUMNS, PHASE_COLUMNS, TOPIC_COLUMNS))
+
+
+def _convert(record, columns, problems, where, *position):
+    """
+    A row of column values from a record, collecting any problems.
+    where is formatted with position only when there is one to report.
+    """
+    if not isinstance(record, dict):
+        problems.append(f'{where.format(*position)}: expected an object')
+        return None
+    row = {}
+    get = record.get
+    for column, convert, default in columns:
+        value = get(column)
+        if type(value) is str and value and convert is _text:
+            row[column] = value
+        elif value is None or value == '':
+            if default is ...:
+                problems.append(f'{where.format(*position)}: {column} is required')
+            row[column] = None if default is ... else default
+        else:
+            try:
+                row[column] = convert(value)
+            except (TypeError, ValueError):
+                problems.append(f'{where.format(*position)}: invalid {column} {value!r}')
+                row[column] = None
+    return row
+
+
+def validate_catalog(data):
+    """
+    Check and normalize a parsed catalog ({"roles": [...]}, or the list of
+    roles itself). Returns role rows, each with 'requirements' and
+    'roadmap' (phases, each with 'topics'); raises CatalogError.
+    """
+    roles = data.get('roles') if isinstance(data, dict) else data
+    if not isinstance(roles, list):
+        raise CatalogError(['expected a list of roles (or {"roles": [...]})'])
+
+    problems = []
+    result = []
+    names = set()
+    for i, record in enumerate(roles):
+        role = _convert(record, _ROLE_SPEC, problems, 'roles[{}]', i)
+        if role is None:
+            continue
+        if role['role_name'] in names:
+            problems.append(f'roles[{i}]: duplicate role_name {role["role_name"]!r}')
+        names.add(role['role_name'])
+
+        role['requirements'] = [
+            _convert(req, _REQUIREMENT_SPEC, problems, 'roles[{}].requirements[{}]', i, j)
+            for j, req in enumerate(record.get('requirements') or [])
+        ]
+
+        role['roadmap'] = []
+        numbers = set()
+        for j, phase_record in enumerate(record.get('roadmap') or []):
+            phase = _convert(phase_record, _PHASE_SPEC, problems, 'roles[{}].roadmap[{}]', i, j)
+            if phase is None:
+                continue
+            if phase['phase_number'] is None:
+                phase['phase_number'] = j + 1
+            if phase['phase_number'] in numbers:
+                problems.append(f'roles[{i}].roadmap[{j}]: '
+                                f'duplicate phase_number {phase["phase_number"]}')
+            numbers.add(phase['phase_number'])
+
+            phase['topics'] = []
+            topic_names = set()
+            for k, topic_record in enumerate(phase_record.get('topics') or []):
+                topic = _convert(topic_record, _TOPIC_SPEC, problems,
+                                 'roles[{}].roadmap[{}].topics[{}]', i, j, k)
+                if topic is None:
+                    continue
+                if topic['topic_order'] is None:
+                    topic['topic_order'] = k + 1
+                if topic['topic_name'] in topic_names:
+                    problems.append(f'roles[{i}].roadmap[{j}].topics[{k}]: '
+                                    f'duplicate topic_name {topic["topic_name"]!r}')
+                topic_names.add(topic['topic_name'])
+                phase['topics'].append(topic)
+            role['roadmap'].append(phase)
+        result.append(role)
+
+    if problems:
+        raise CatalogError(problems)
+    return result
+
+
+# ==========================================
+# READERS
+# ==========================================
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def read_csv_directory(path):
+    """Nest roles.csv, requirements.csv, phases.csv and topics.csv into roles"""
+    if not os.path.exists(os.path.join(path, 'roles.csv')):
+        raise CatalogError([f'{path}: no roles.csv'])
+    tables = {}
+    for name in CSV_FILES:
+        file_path = os.path.join(path, name)
+        tables[name] = _read_csv(file_path) if os.path.exists(file_path) else []
+
+    roles = {}
+    for row in tables['roles.csv']:
+        role = dict(row, requirements=[], roadmap=[])
+        roles.setdefault(row.get('role_name'), role)
+    problems = []
+
+    def owner(table, i, row):
+        role = roles.get(row.get('role_name'))
+        if role is None:
+            problems.append(f'{table} row {i + 2}: unknown role_name {row.get("role_name")!r}')
+        return role
+
+    for i, row in enumerate(tables['requirements.csv']):
+        role = owner('requirements.csv', i, row)
+        if role is not None:
+            role['requirements'].append(row)
+
+    phases = {}
+    for i, row in enumerate(tables['phases.csv']):
+        role = owner('phases.csv', i, row)
+        if role is not None:
+            phase = dict(row, topics=[])
+            role['roadmap'].append(phase)
+            # A blank phase_number means the phase's position, as in JSON
+            number = (row.get('phase_number') or '').strip() or str(len(role['roadmap']))
+            phases[(row.get('role_name'), number)] = phase
+
+    for i, row in enumerate(tables['topics.csv']):
+        phase = phases.get((row.get('role_name'), (row.get('phase_number') or '').strip()))
+        if phase is None:
+            problems.append(f'topics.csv row {i + 2}: no phase {row.get("phase_number")!r} '
+                            f'for role {row.get("role_name")!r}')
+        else:
+            phase['topics'].append(row)
+
+    if problems:
+        raise CatalogError(problems)
+    return list(roles.values())
+
+
+def read_catalog(path):
+    """Parse and validate a .json/.yaml/.yml file or a directory of CSV files"""
+    if not os.path.exists(path):
+        raise CatalogError([f'{path}: no such file or directory'])
+    if os.path.isdir(path):
+        data = read_csv_directory(path)
+    elif path.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise CatalogError([f'{path}: reading YAML needs PyYAML (pip install pyyaml)'])
+        with open(path, encoding='utf-8') as f:
+            try:
+                data = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise CatalogError([f'{path}: {e}'])
+    elif path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise CatalogError([f'{path}: {e}'])
+    else:
+        raise CatalogError([f'{path}: expected a .json, .yaml or .yml file or a CSV directory'])
+    return validate_catalog(data)
+
+
+# ==========================================
+# LOADER
+# ==========================================
+
+def _next_id(conn, table):
+    """First id above every used one (AUTOINCREMENT never reuses ids)"""
+    used = conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0]
+    row = conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,)).fetchone()
+    return max(used, row[0] if row else 0) + 1
+
+
+def _fill_ids(conn, ids):
+    """Stage ids in temp.import_ids for IN (...) filters of any size"""
+    conn.execute('DELETE FROM temp.import_ids')
+    conn.executemany('INSERT INTO temp.import_ids (id) VALUES (?)', [(row_id,) for row_id in ids])
+
+
+def _existing(conn, query, *key_columns):
+    """{key: (id, *columns)} for the rows a query returns (id first, then the columns)"""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    key = itemgetter(*key_columns)
+    return {key(row): row for row in cursor.execute(query)}
+
+
+class _Table:
+    """Rows to write to one catalog table, matched against the stored ones"""
+
+    def __init__(self, conn, name, columns, existing):
+        self.name = name
+        self.columns = columns
+        self.existing = existing
+        self.next_id = _next_id(conn, name)
+        self.inserts = []
+        self.updates = []
+
+    def put(self, key, values):
+        """Queue values (in column order) for key; returns the row id"""
+        row = self.existing.pop(key, None)
+        if row is None:
+            row_id = self.next_id
+            self.next_id += 1
+            self.inserts.append((row_id, *values))
+        else:
+            row_id = row[0]
+            if row[1:] != values:
+                self.updates.append((*values, row_id))
+        return row_id
+
+    def write(self, conn):
+        assignments = ', '.join(f'{column} = ?' for column in self.columns)
+        conn.executemany(f'UPDATE {self.name} SET {assignments} WHERE id = ?', self.updates)
+        conn.executemany(f'''
+            INSERT INTO {self.name} (id, {', '.join(self.columns)})
+            VALUES (?{', ?' * len(self.columns)})
+        ''', self.inserts)
+
+
+def _deferrable(conn):
+    """
+    Secondary indexes and version-bump triggers on the catalog tables as
+    (type, name, sql). A big load drops them, writes, then recreates them
+    (and bumps the version once) inside the same transaction.
+    """
+    return conn.execute(f'''
+        SELECT type, name, sql FROM sqlite_master
+        WHERE tbl_name IN ({', '.join('?' * len(CATALOG_TABLES))}) AND sql IS NOT NULL
+          AND (type = 'index' OR (type = 'trigger' AND name LIKE '%\\_bump\\_version' ESCAPE '\\'))
+    ''', CATALOG_TABLES).fetchall()
+
+
+def import_catalog(conn, roles, skip_existing=False, prune=False):
+    """
+    Write validated roles (see validate_catalog) in one transaction.
+    Unchanged rows are not written, so re-importing the same file leaves
+    the catalog version alone. With prune, phases and topics the file no
+    longer lists for its roles are deleted. Returns what was written.
+    """
+    started = time.perf_counter()
+    role_values = itemgetter(*ROLE_COLUMNS)
+    requirement_values = itemgetter(*REQUIREMENT_COLUMNS)
+    phase_values = itemgetter(*PHASE_COLUMNS)
+    topic_values = itemgetter(*TOPIC_COLUMNS)
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS import_ids (id INTEGER PRIMARY KEY)')
+
+        # Roles by name, then what the imported ones already have
+        career_roles = _Table(conn, 'career_roles', list(ROLE_COLUMNS), _existing(
+            conn, f'SELECT id, {", ".join(ROLE_COLUMNS)} FROM career_roles', 1))
+        skipped = 0
+        if skip_existing:
+            skipped = sum(role['role_name'] in career_roles.existing for role in roles)
+            roles = [role for role in roles if role['role_name'] not in career_roles.existing]
+        known = [career_roles.existing[role['role_name']][0] for role in roles
+                 if role['role_name'] in career_roles.existing]
+        _fill_ids(conn, known)
+
+        old_requirements = {}
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        for row in cursor.execute(f'''
+            SELECT role_id, {', '.join(REQUIREMENT_COLUMNS)} FROM role_requirements
+            WHERE role_id IN (SELECT id FROM temp.import_ids)
+            ORDER BY role_id, id
+        '''):
+            old_requirements.setdefault(row[0], []).append(row[1:])
+        phases = _Table(conn, 'roadmap_phases', ['role_id', *PHASE_COLUMNS], _existing(conn, f'''
+            SELECT id, role_id, {', '.join(PHASE_COLUMNS)} FROM roadmap_phases
+            WHERE role_id IN (SELECT id FROM temp.import_ids)
+        ''', 1, 2))
+        topics = _Table(conn, 'roadmap_topics', ['phase_id', *TOPIC_COLUMNS], _existing(conn, f'''
+            SELECT t.id, t.phase_id, {', '.join('t.' + column for column in TOPIC_COLUMNS)}
+            FROM roadmap_topics t
+            JOIN roadmap_phases p ON p.id = t.phase_id
+            WHERE p.role_id IN (SELECT id FROM temp.import_ids)
+        ''', 1, 2))
+
+        # Match every row; links are resolved once per distinct topic name
+        replaced = []
+        requirements = []
+        links = {}
+        for role in roles:
+            role_id = career_roles.put(role['role_name'], role_values(role))
+            rows = [requirement_values(req) for req in role['requirements']]
+            if rows != old_requirements.get(role_id, []):
+                replaced.append(role_id)
+                requirements.extend((role_id, *row) for row in rows)
+            for phase in role['roadmap']:
+                phase_id = phases.put((role_id, phase['phase_number']),
+                                      (role_id, *phase_values(phase)))
+                for topic in phase['topics']:
+                    if not topic['resource_link']:
+                        name = topic['topic_name']
+                        link = links.get(name)
+                        if link is None:
+                            link = links[name] = get_mdn_link(name)
+                        topic['resource_link'] = link
+                    topics.put((phase_id, topic['topic_name']), (phase_id, *topic_values(topic)))
+
+        written = (len(career_roles.inserts) + len(career_roles.updates) + len(requirements)
+                   + len(phases.inserts) + len(phases.updates)
+                   + len(topics.inserts) + len(topics.updates))
+        deferred = _deferrable(conn) if written >= DEFER_INDEXES_MIN_ROWS else []
+        for kind, name, _ in deferred:
+            conn.execute(f'DROP {kind.upper()} {name}')
+
+        career_roles.write(conn)
+        _fill_ids(conn, replaced)
+        conn.execute('''
+            DELETE FROM role_requirements WHERE role_id IN (SELECT id FROM temp.import_ids)
+        ''')
+        conn.executemany(f'''
+            INSERT INTO role_requirements (role_id, {', '.join(REQUIREMENT_COLUMNS)})
+            VALUES (?{', ?' * len(REQUIREMENT_COLUMNS)})
+        ''', requirements)
+        phases.write(conn)
+        topics.write(conn)
+
+        for _, _, sql in deferred:
+            conn.execute(sql)
+        if deferred:
+            bump_catalog_version(conn, scoring=bool(career_roles.inserts or career_roles.updates
+                                                    or replaced))
+
+        # Whatever the file no longer lists for these roles, except topics
+        # students have progress on (their counters would drift). NULLs are
+        # filtered out: one NULL in a NOT IN list makes it match nothing
+        topics_deleted = phases_deleted = 0
+        if prune:
+            _fill_ids(conn, [row[0] for row in topics.existing.values()])
+            topics_deleted = conn.execute('''
+                DELETE FROM roadmap_topics
+                WHERE id IN (SELECT id FROM temp.import_ids)
+                  AND id NOT IN (SELECT topic_id FROM topic_progress)
+                  AND id NOT IN (SELECT topic_id FROM user_progress WHERE topic_id IS NOT NULL)
+            ''').rowcount
+            _fill_ids(conn, [row[0] for row in phases.existing.values()])
+            phases_deleted = conn.execute('''
+                DELETE FROM roadmap_phases
+                WHERE id IN (SELECT id FROM temp.import_ids)
+                  AND NOT EXISTS (SELECT 1 FROM roadmap_topics t
+                                  WHERE t.phase_id = roadmap_phases.id)
+            ''').rowcount
+
+        conn.execute('DROP TABLE temp.import_ids')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if deferred:
+        conn.execute('ANALYZE')
+        conn.commit()
+    return {
+        'roles_inserted': len(career_roles.inserts),
+        'roles_updated': len(career_roles.updates),
+        'roles_skipped': skipped,
+        'requirements_replaced': len(replaced),
+        'phases_inserted': len(phases.inserts),
+        'phases_updated': len(phases.updates),
+        'phases_deleted': phases_deleted,
+        'topics_inserted': len(topics.inserts),
+        'topics_updated': len(topics.updates),
+        'topics_deleted': topics_deleted,
+        'topics_kept': len(topics.existing) - topics_deleted if prune else 0,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import career roles and roadmaps.')
+    parser.add_argument('path', help='.json, .yaml/.yml file, or a directory of CSV files')
+    parser.add_argument('--skip-existing', action='store_true',
+                        help='only add roles that are not in the database yet')
+    parser.add_argument('--prune', action='store_true',
+                        help="delete phases and topics the file no longer lists for its roles")
+    parser.add_argument('--database', default=DATABASE_PATH)
+    args = parser.parse_args(argv)
+
+    try:
+        roles = read_catalog(args.path)
+    except CatalogError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    from migrations import migrate
+
+    conn = connect(args.database)
+    try:
+        migrate(conn)
+        stats = import_catalog(conn, roles, skip_existing=args.skip_existing, prune=args.prune)
+    finally:
+        conn.close()
+    print(f"Imported {len(roles)} roles in {stats.pop('seconds')}s")
+    for name, count in stats.items():
+        print(f"   - {name.replace('_', ' ')}: {count}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
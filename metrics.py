@@ -0,0 +1,333 @@
+"""
+Career Compass Platform - Instrumentation
+Opt-in request metrics, Prometheus exposition and slow-request profiling
+
+    METRICS_ENABLED=1              per-endpoint latency, SQL and scoring time at /metrics
+    SERVER_TIMING=1                also send a Server-Timing header on every response
+    PROFILE_SLOW_REQUESTS_MS=500   sample stacks of every request and keep the slow ones
+    PROFILE_DIR=profiles           where folded stacks are written (flamegraph.pl input)
+    METRICS_TOKEN=...              bearer token /metrics requires (404 without it)
+
+Metrics are kept per worker process.
+"""
+
+import contextvars
+import hmac
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+def _flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+SERVER_TIMING = _flag('SERVER_TIMING')
+PROFILE_SLOW_REQUESTS_MS = float(os.environ.get('PROFILE_SLOW_REQUESTS_MS', 0) or 0)
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL_MS', 5)) / 1000
+METRICS_ENABLED = _flag('METRICS_ENABLED') or SERVER_TIMING or PROFILE_SLOW_REQUESTS_MS > 0
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+# ==========================================
+# METRIC TYPES
+# ==========================================
+
+def _labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{str(value).replace(chr(34), chr(39))}"'
+                     for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class CounterMetric:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} counter'
+        with self._lock:
+            for labels, value in sorted(self.values.items()):
+                yield f'{self.name}{_labels(self.labels, labels)} {value}'
+
+
+class HistogramMetric:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.values = {}  # labels -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} histogram'
+        names = self.labels + ('le',)
+        with self._lock:
+            for labels, series in sorted(self.values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    yield f'{self.name}_bucket{_labels(names, labels + (bound,))} {cumulative}'
+                yield f'{self.name}_bucket{_labels(names, labels + ("+Inf",))} {series[-2]}'
+                yield f'{self.name}_count{_labels(self.labels, labels)} {series[-2]}'
+                yield f'{self.name}_sum{_labels(self.labels, labels)} {series[-1]}'
+
+
+REQUESTS = CounterMetric('http_requests_total', 'Requests handled',
+                         ('endpoint', 'method', 'status'))
+LATENCY = HistogramMetric('http_request_duration_seconds',
+                          'Time until the response (or its first byte when streamed)',
+                          ('endpoint', 'method'))
+SQL_QUERIES = HistogramMetric('db_queries_per_request', 'SQL statements executed per request',
+                              ('endpoint',), QUERY_COUNT_BUCKETS)
+SQL_TIME = CounterMetric('db_query_seconds_total', 'Time spent executing SQL statements',
+                         ('endpoint',))
+TIMED = CounterMetric('section_seconds_total', 'Time spent in instrumented sections',
+                      ('section', 'endpoint'))
+TIMED_CALLS = CounterMetric('section_calls_total', 'Calls of instrumented sections',
+                            ('section', 'endpoint'))
+
+_metrics = [REQUESTS, LATENCY, SQL_QUERIES, SQL_TIME, TIMED, TIMED_CALLS]
+
+# name -> callable returning {stat: number}; sampled at scrape time
+_collectors = {}
+
+
+def register_collector(name, collect):
+    """Expose a stats() style dict as gauges named <name>_<stat>"""
+    _collectors[name] = collect
+
+
+# ==========================================
+# PER-REQUEST ACCOUNTING
+# ==========================================
+
+class RequestStats:
+    __slots__ = ('endpoint', 'started', 'queries', 'sql_time', 'sections')
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.sections = {}
+
+
+_current = contextvars.ContextVar('request_stats', default=None)
+
+
+def record_query(elapsed):
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.sql_time += elapsed
+
+
+@contextmanager
+def timed(section):
+    """Accumulate the time spent in a block under a section name"""
+    if not METRICS_ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stats = _current.get()
+        endpoint = stats.endpoint if stats is not None else 'none'
+        if stats is not None:
+            stats.sections[section] = stats.sections.get(section, 0.0) + elapsed
+        TIMED.inc(section, endpoint, amount=elapsed)
+        TIMED_CALLS.inc(section, endpoint)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Counts and times statements run through the connection shortcuts"""
+
+    def execute(self, sql, parameters=(), /):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record_query(time.perf_counter() - started)
+
+    def executemany(self, sql, parameters, /):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            record_query(time.perf_counter() - started)
+
+
+def connection_factory():
+    return InstrumentedConnection if METRICS_ENABLED else sqlite3.Connection
+
+
+# ==========================================
+# SLOW REQUEST PROFILING
+# ==========================================
+
+class StackSampler:
+    """
+    Background thread sampling the stacks of threads that are serving a
+    request. Stacks are folded root-first ("a;b;c count"), the input
+    format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL):
+        self.interval = interval
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, ident):
+        with self._lock:
+            self._active[ident] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+
+    def stop(self, ident):
+        with self._lock:
+            return self._active.pop(ident, Counter())
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, stacks in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        stacks[self._fold(frame)] += 1
+
+    @staticmethod
+    def _fold(frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+
+_sampler = StackSampler()
+
+
+def _dump_stacks(stacks, endpoint, elapsed):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = re.sub(r'[^A-Za-z0-9_.-]', '_', endpoint or 'unmatched')
+    path = os.path.join(PROFILE_DIR, f'{time.strftime("%Y%m%d-%H%M%S")}-{name}-{elapsed * 1000:.0f}ms.folded')
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+    return path
+
+
+# ==========================================
+# FLASK INTEGRATION
+# ==========================================
+
+def render_metrics():
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for name, collect in sorted(_collectors.items()):
+        for stat, value in sorted(collect().items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            lines.append(f'# TYPE {name}_{stat} gauge')
+            lines.append(f'{name}_{stat} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app):
+    """Install the hooks and /metrics; does nothing unless enabled"""
+    if not METRICS_ENABLED:
+        return
+
+    from flask import request
+
+    def start_request():
+        _current.set(RequestStats(request.endpoint or 'unmatched'))
+        if PROFILE_SLOW_REQUESTS_MS:
+            _sampler.start(threading.get_ident())
+
+    def finish_request(response):
+        stats = _current.get()
+        if stats is None:
+            return response
+        elapsed = time.perf_counter() - stats.started
+
+        REQUESTS.inc(stats.endpoint, request.method, response.status_code)
+        LATENCY.observe(elapsed, stats.endpoint, request.method)
+        SQL_QUERIES.observe(stats.queries, stats.endpoint)
+        SQL_TIME.inc(stats.endpoint, amount=stats.sql_time)
+
+        if SERVER_TIMING:
+            timings = [f'app;dur={elapsed * 1000:.2f}',
+                       f'db;dur={stats.sql_time * 1000:.2f};desc="{stats.queries} queries"']
+            timings += [f'{section};dur={seconds * 1000:.2f}'
+                        for section, seconds in stats.sections.items()]
+            response.headers['Server-Timing'] = ', '.join(timings)
+
+        if PROFILE_SLOW_REQUESTS_MS:
+            stacks = _sampler.stop(threading.get_ident())
+            if elapsed * 1000 >= PROFILE_SLOW_REQUESTS_MS and stacks:
+                path = _dump_stacks(stacks, stats.endpoint, elapsed)
+                app.logger.warning('Slow request %s %s took %.0f ms; stacks in %s',
+                                   request.method, request.path, elapsed * 1000, path)
+        return response
+
+    def reset_request(exc=None):
+        if PROFILE_SLOW_REQUESTS_MS:
+            _sampler.stop(threading.get_ident())
+        _current.set(None)
+
+    # Run ahead of every other hook so redirects are measured too
+    app.before_request_funcs.setdefault(None, []).insert(0, start_request)
+    app.after_request(finish_request)
+    app.teardown_request(reset_request)
+
+    def metrics_endpoint():
+        supplied = request.headers.get('Authorization', '')
+        if not METRICS_TOKEN or not hmac.compare_digest(supplied.encode(),
+                                                        f'Bearer {METRICS_TOKEN}'.encode()):
+            return app.response_class('Not found\n', status=404, mimetype='text/plain')
+        return app.response_class(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule('/metrics', 'metrics', metrics_endpoint)
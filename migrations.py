@@ -0,0 +1,487 @@
+"""
+Career Compass Platform - Schema Migrations
+Versioned, forward-only and idempotent; never drops user data
+"""
+
+from catalog import CATALOG_TABLES, SCORING_TABLES
+from profiles import backfill_from_json
+from resources import fill_missing_links
+
+
+def _table_columns(conn, table):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def _has_unique_index(conn, table, columns):
+    for index in conn.execute(f'PRAGMA index_list({table})'):
+        name, unique = index[1], index[2]
+        indexed = tuple(row[2] for row in conn.execute(f'PRAGMA index_info({name})'))
+        if unique and indexed == tuple(columns):
+            return True
+    return False
+
+
+# ==========================================
+# MIGRATIONS
+# ==========================================
+
+BASE_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT UNIQUE,
+        password TEXT,
+        user_type TEXT DEFAULT 'student', -- 'student' or 'parent'
+        specialization TEXT,
+        current_year INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS user_preferences (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        skills TEXT,  -- JSON array of {skill: level}
+        internship_done BOOLEAN DEFAULT 0,
+        internship_role TEXT,
+        internship_duration INTEGER,
+        projects TEXT,  -- JSON array of projects
+        interest_areas TEXT,  -- JSON array
+        preferred_work_type TEXT,
+        salary_priority INTEGER,
+        career_goal TEXT,
+        timeline TEXT,
+        learning_pace TEXT,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS career_roles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        role_name TEXT UNIQUE NOT NULL,
+        category TEXT,
+        primary_specialization TEXT,
+        related_specializations TEXT,
+        description TEXT,
+        avg_salary_range TEXT,
+        avg_salary_numeric INTEGER,
+        demand_level TEXT,
+        growth_rate TEXT,
+        difficulty TEXT,
+        entry_friendly BOOLEAN,
+        remote_friendly BOOLEAN,
+        experience_required TEXT,
+        tech_stack TEXT,
+        related_internships TEXT,
+        transferable_skills BOOLEAN DEFAULT 1,
+        specialization_heavy BOOLEAN DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS role_requirements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        role_id INTEGER,
+        skill_name TEXT,
+        skill_level TEXT,  -- Beginner, Intermediate, Advanced
+        is_required BOOLEAN DEFAULT 1,  -- required vs nice-to-have
+        weight INTEGER DEFAULT 1,  -- importance weight
+        FOREIGN KEY (role_id) REFERENCES career_roles(id) ON DELETE CASCADE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS roadmap_phases (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        role_id INTEGER,
+        phase_number INTEGER,
+        phase_name TEXT,
+        phase_description TEXT,
+        estimated_duration TEXT,
+        FOREIGN KEY (role_id) REFERENCES career_roles(id) ON DELETE CASCADE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS roadmap_topics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        phase_id INTEGER,
+        topic_name TEXT,
+        topic_order INTEGER,
+        description TEXT,
+        resource_link TEXT,
+        resource_type TEXT,
+        is_essential BOOLEAN DEFAULT 1,
+        is_checkpoint BOOLEAN DEFAULT 0,
+        prerequisite_topic_id INTEGER,
+        position_x INTEGER,
+        position_y INTEGER,
+        FOREIGN KEY (phase_id) REFERENCES roadmap_phases(id) ON DELETE CASCADE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS user_progress (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        topic_id INTEGER,
+        status TEXT DEFAULT 'not_started',  -- not_started, learning, completed
+        completed_at TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+        FOREIGN KEY (topic_id) REFERENCES roadmap_topics(id) ON DELETE CASCADE
+    )
+    ''',
+]
+
+# Queried by app.py but previously only ever created by hand
+ENROLLMENT_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS student_enrollments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        role_id INTEGER NOT NULL,
+        enrolled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'active',
+        FOREIGN KEY (user_id) REFERENCES users(id),
+        FOREIGN KEY (role_id) REFERENCES career_roles(id),
+        UNIQUE (user_id, role_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS topic_progress (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        role_id INTEGER NOT NULL,
+        topic_id INTEGER NOT NULL,
+        completed BOOLEAN DEFAULT 0,
+        completed_at TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id),
+        FOREIGN KEY (role_id) REFERENCES career_roles(id),
+        FOREIGN KEY (topic_id) REFERENCES roadmap_topics(id),
+        UNIQUE (user_id, role_id, topic_id)
+    )
+    ''',
+]
+
+
+def catalog_version_tracking(conn):
+    """
+    A single-row counter bumped by triggers whenever the catalog tables
+    change, so each process can tell its compiled catalog is stale.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    if 'updated_at' not in _table_columns(conn, 'catalog_version'):
+        conn.execute('ALTER TABLE catalog_version ADD COLUMN updated_at TIMESTAMP')
+    conn.execute('''
+        INSERT OR IGNORE INTO catalog_version (id, version, updated_at)
+        VALUES (1, 0, CURRENT_TIMESTAMP)
+    ''')
+    conn.execute('UPDATE catalog_version SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL')
+
+    for table in CATALOG_TABLES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_bump_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE catalog_version
+                    SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = 1;
+                END
+            ''')
+
+
+def enrollment_progress_counters(conn):
+    """
+    Completed-topic counter per (user, role), adjusted by +/-1 whenever a
+    topic_progress row actually flips; backfilled from topic_progress.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'enrollment_progress'"
+    ).fetchone()
+    if exists:
+        return
+    conn.execute('''
+        CREATE TABLE enrollment_progress (
+            user_id INTEGER NOT NULL,
+            role_id INTEGER NOT NULL,
+            completed_topics INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, role_id),
+            FOREIGN KEY (user_id) REFERENCES users(id),
+            FOREIGN KEY (role_id) REFERENCES career_roles(id)
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO enrollment_progress (user_id, role_id, completed_topics)
+        SELECT user_id, role_id, COUNT(*)
+        FROM topic_progress
+        WHERE completed = 1
+        GROUP BY user_id, role_id
+    ''')
+
+
+def merge_duplicate_preferences(conn):
+    """
+    Fold duplicate user_preferences rows into the newest row of each
+    student before the unique index goes on. Every column the newest row
+    leaves NULL takes the latest non-NULL value of an older row; only
+    then are the older rows removed.
+    """
+    columns = [column for column in _table_columns(conn, 'user_preferences')
+               if column not in ('id', 'user_id')]
+    survivors = '''
+        SELECT MAX(id) FROM user_preferences
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id HAVING COUNT(*) > 1
+    '''
+    assignments = [f'''
+        {column} = COALESCE({column}, (
+            SELECT older.{column} FROM user_preferences AS older
+            WHERE older.user_id = keep.user_id AND older.{column} IS NOT NULL
+            ORDER BY older.id DESC LIMIT 1))''' for column in columns]
+    if assignments:
+        conn.execute(f'''
+            UPDATE user_preferences AS keep SET {', '.join(assignments)}
+            WHERE id IN ({survivors})
+        ''')
+    conn.execute('''
+        DELETE FROM user_preferences
+        WHERE user_id IS NOT NULL
+          AND id NOT IN (SELECT MAX(id) FROM user_preferences GROUP BY user_id)
+    ''')
+
+
+def lookup_indexes(conn):
+    """Indexes (and unique keys) behind every lookup in app.py"""
+    merge_duplicate_preferences(conn)
+    for statement in (
+        # Login and the parent dashboard's student listing
+        'CREATE INDEX IF NOT EXISTS idx_users_login ON users (email, password, user_type)',
+        'CREATE INDEX IF NOT EXISTS idx_users_type_email ON users (user_type, email)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_user_preferences_user ON user_preferences (user_id)',
+        # Roadmap assembly and topic totals
+        'CREATE INDEX IF NOT EXISTS idx_roadmap_phases_role ON roadmap_phases (role_id, phase_number)',
+        'CREATE INDEX IF NOT EXISTS idx_roadmap_topics_phase ON roadmap_topics (phase_id, topic_order)',
+        'CREATE INDEX IF NOT EXISTS idx_role_requirements_role ON role_requirements (role_id)',
+        # Enrollments listed newest first
+        'CREATE INDEX IF NOT EXISTS idx_student_enrollments_user ON student_enrollments (user_id, enrolled_at, id)',
+    ):
+        conn.execute(statement)
+
+    # Enrollment and progress lookups (and the progress UPSERT) rely on these
+    # unique keys; tables created by hand before migrations may lack them
+    for table, columns in (('student_enrollments', ('user_id', 'role_id')),
+                           ('topic_progress', ('user_id', 'role_id', 'topic_id'))):
+        if not _has_unique_index(conn, table, columns):
+            conn.execute(f'''
+                CREATE UNIQUE INDEX idx_{table}_{'_'.join(columns)}
+                ON {table} ({', '.join(columns)})
+            ''')
+
+
+# Parent dashboard pages through students in id order
+DASHBOARD_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_users_type_id ON users (user_type, id)',
+]
+
+# Each student's top roles, rewritten whenever their profile is saved and
+# recomputed in bulk once the scoring version moves on (the column predates
+# it and keeps its name)
+RECOMMENDATION_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS student_recommendations (
+        user_id INTEGER NOT NULL,
+        rank INTEGER NOT NULL,  -- 0 = best match
+        role_id INTEGER NOT NULL,
+        score INTEGER NOT NULL,
+        grade TEXT,
+        match_level TEXT,
+        breakdown TEXT,  -- JSON compatibility breakdown
+        catalog_version INTEGER NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (user_id, rank),
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+        FOREIGN KEY (role_id) REFERENCES career_roles(id)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_student_recommendations_version ON student_recommendations (catalog_version)',
+]
+
+# Checkpoints for rescore.py so an interrupted run can resume
+RESCORE_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS rescore_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mode TEXT NOT NULL,  -- 'stale' or 'all'
+        catalog_version INTEGER,
+        last_user_id INTEGER NOT NULL DEFAULT 0,  -- every student up to here is done
+        processed INTEGER NOT NULL DEFAULT 0,
+        started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP,
+        finished_at TIMESTAMP
+    )
+    ''',
+]
+
+
+def normalized_profiles(conn):
+    """
+    Skills and interests as rows, so they can be joined and filtered in
+    SQL; backfilled from the JSON columns, which are still written.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,  -- spelling as entered
+            canonical_key TEXT NOT NULL  -- alias-resolved key shared by all spellings
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_skills (
+            user_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,  -- order entered; the first matching skill is reported
+            skill_id INTEGER NOT NULL,
+            level TEXT,
+            PRIMARY KEY (user_id, position),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (skill_id) REFERENCES skills(id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_interests (
+            user_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            interest TEXT,
+            PRIMARY KEY (user_id, position),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    ''')
+    for statement in (
+        'CREATE INDEX IF NOT EXISTS idx_skills_canonical ON skills (canonical_key)',
+        # "Every student with Advanced Python"
+        'CREATE INDEX IF NOT EXISTS idx_user_skills_skill ON user_skills (skill_id, level, user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_user_interests_interest ON user_interests (interest, user_id)',
+    ):
+        conn.execute(statement)
+    backfill_from_json(conn)
+
+
+def progress_version_tracking(conn):
+    """
+    A counter per student bumped by triggers whenever their enrollments or
+    topic progress change; progress responses use it as their ETag.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS progress_versions (
+            user_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for table in ('student_enrollments', 'topic_progress'):
+        for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_bump_progress
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO progress_versions (user_id, version) VALUES ({row}.user_id, 1)
+                    ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+                END
+            ''')
+
+
+def scoring_version_tracking(conn):
+    """
+    A second counter beside the catalog version, bumped only when a table
+    scores depend on changes; the scoring tables' triggers now bump both.
+    Recommendations stored so far were keyed on the catalog version, so
+    the new counter starts from it and they stay valid.
+    """
+    if 'scoring_version' not in _table_columns(conn, 'catalog_version'):
+        conn.execute('ALTER TABLE catalog_version ADD COLUMN scoring_version INTEGER NOT NULL DEFAULT 0')
+        conn.execute('UPDATE catalog_version SET scoring_version = version')
+
+    for table in SCORING_TABLES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'DROP TRIGGER IF EXISTS {table}_{event.lower()}_bump_version')
+            conn.execute(f'''
+                CREATE TRIGGER {table}_{event.lower()}_bump_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE catalog_version
+                    SET version = version + 1, scoring_version = scoring_version + 1,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = 1;
+                END
+            ''')
+
+
+# (version, name, list of statements or callable), applied in order
+MIGRATIONS = [
+    (1, 'base schema', BASE_SCHEMA),
+    (2, 'enrollment and topic progress tables', ENROLLMENT_SCHEMA),
+    (3, 'catalog version tracking', catalog_version_tracking),
+    (4, 'enrollment progress counters', enrollment_progress_counters),
+    (5, 'lookup indexes', lookup_indexes),
+    (6, 'stored resource links', fill_missing_links),
+    (7, 'dashboard keyset index', DASHBOARD_INDEXES),
+    (8, 'materialized student recommendations', RECOMMENDATION_SCHEMA),
+    (9, 'rescore checkpoints', RESCORE_SCHEMA),
+    (10, 'normalized skills and interests', normalized_profiles),
+    (11, 'progress version tracking', progress_version_tracking),
+    (12, 'scoring version tracking', scoring_version_tracking),
+]
+
+
+# ==========================================
+# RUNNER
+# ==========================================
+
+def migrate(conn):
+    """
+    Apply every pending migration, each in its own transaction, then
+    refresh planner statistics. Safe to run from several workers at once.
+    Returns the versions applied.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.commit()
+
+    done = {row[0] for row in conn.execute('SELECT version FROM schema_version')}
+
+    applied = []
+    for version, name, steps in MIGRATIONS:
+        if version in done:
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Another worker may have applied it while we waited for the lock
+            if conn.execute('SELECT 1 FROM schema_version WHERE version = ?',
+                            (version,)).fetchone():
+                conn.rollback()
+                continue
+            if callable(steps):
+                steps(conn)
+            else:
+                for statement in steps:
+                    conn.execute(statement)
+            conn.execute('INSERT INTO schema_version (version, name) VALUES (?, ?)',
+                         (version, name))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+
+    if applied:
+        conn.execute('ANALYZE')
+        conn.commit()
+    return applied
@@ -0,0 +1,144 @@
+"""
+Career Compass Platform - Student Profiles
+Skills and interests stored as rows (user_skills, user_interests, skills)
+"""
+
+import json
+
+from skills import SkillIndex
+
+# Aliases are fixed, so one index canonicalizes every stored skill name
+_canonical_index = SkillIndex()
+
+# Keeps IN (...) lists well under SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
+
+def canonical_skill(name):
+    return _canonical_index.canonical(name)
+
+
+def _chunks(items, size=IN_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def skill_ids(conn, names):
+    """Dictionary ids for skill names, adding any new spelling"""
+    names = list(dict.fromkeys(names))
+    conn.executemany('INSERT OR IGNORE INTO skills (name, canonical_key) VALUES (?, ?)',
+                     [(name, canonical_skill(name)) for name in names])
+    ids = {}
+    for chunk in _chunks(names):
+        ids.update(conn.execute(f'''
+            SELECT name, id FROM skills WHERE name IN ({', '.join('?' * len(chunk))})
+        ''', chunk).fetchall())
+    return ids
+
+
+def save_skills_and_interests(conn, user_id, skills, interests):
+    """
+    Replace a student's skills ({name: level}, in the order given) and
+    interests; the caller commits.
+    """
+    skills = skills if isinstance(skills, dict) else {}
+    interests = interests if isinstance(interests, list) else []
+    ids = skill_ids(conn, [str(name) for name in skills])
+
+    conn.execute('DELETE FROM user_skills WHERE user_id = ?', (user_id,))
+    conn.executemany('''
+        INSERT INTO user_skills (user_id, position, skill_id, level) VALUES (?, ?, ?, ?)
+    ''', [(user_id, position, ids[str(name)], level)
+          for position, (name, level) in enumerate(skills.items())])
+
+    conn.execute('DELETE FROM user_interests WHERE user_id = ?', (user_id,))
+    conn.executemany('''
+        INSERT INTO user_interests (user_id, position, interest) VALUES (?, ?, ?)
+    ''', [(user_id, position, interest) for position, interest in enumerate(interests)])
+
+
+def backfill_from_json(conn):
+    """
+    Copy every user_preferences JSON skills/interests pair into the
+    normalized tables (rows that do not parse are left out).
+    Returns the number of students copied.
+    """
+    copied = 0
+    rows = conn.execute('''
+        SELECT user_id, skills, interest_areas FROM user_preferences
+        WHERE user_id IS NOT NULL
+    ''').fetchall()
+    for user_id, skills, interests in rows:
+        try:
+            skills = json.loads(skills) if skills else {}
+        except ValueError:
+            skills = {}
+        try:
+            interests = json.loads(interests) if interests else []
+        except ValueError:
+            interests = []
+        save_skills_and_interests(conn, user_id, skills, interests)
+        copied += 1
+    return copied
+
+
+# ==========================================
+# READS
+# ==========================================
+
+def load_skills(conn, user_ids):
+    """{user id: {skill name: level}} in each student's own order"""
+    skills = {}
+    for chunk in _chunks(list(user_ids)):
+        for user_id, name, level in conn.execute(f'''
+            SELECT us.user_id, s.name, us.level
+            FROM user_skills us
+            JOIN skills s ON s.id = us.skill_id
+            WHERE us.user_id IN ({', '.join('?' * len(chunk))})
+            ORDER BY us.user_id, us.position
+        ''', chunk):
+            skills.setdefault(user_id, {})[name] = level
+    return skills
+
+
+def load_interests(conn, user_ids):
+    """{user id: [interest, ...]} in each student's own order"""
+    interests = {}
+    for chunk in _chunks(list(user_ids)):
+        for user_id, interest in conn.execute(f'''
+            SELECT user_id, interest FROM user_interests
+            WHERE user_id IN ({', '.join('?' * len(chunk))})
+            ORDER BY user_id, position
+        ''', chunk):
+            interests.setdefault(user_id, []).append(interest)
+    return interests
+
+
+def load_profiles(conn, students):
+    """
+    Scoring profiles for student rows (id, name, specialization,
+    current_year, career_goal, timeline), in the same order.
+    """
+    user_ids = [student['id'] for student in students]
+    skills = load_skills(conn, user_ids)
+    interests = load_interests(conn, user_ids)
+    return [{
+        'name': student['name'],
+        'specialization': student['specialization'],
+        'skills': skills.get(student['id'], {}),
+        'interest_areas': interests.get(student['id'], []),
+        'career_goal': student['career_goal'],
+        'timeline': student['timeline'],
+        'current_year': student['current_year']
+    } for student in students]
+
+
+def load_profile(conn, user_id):
+    """One student's profile, or None without saved preferences"""
+    student = conn.execute('''
+        SELECT u.id, u.name, u.specialization, u.current_year, up.career_goal, up.timeline
+        FROM users u
+        JOIN user_preferences up ON up.user_id = u.id
+        WHERE u.id = ?
+    ''', (user_id,)).fetchone()
+    return load_profiles(conn, [student])[0] if student else None
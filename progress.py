@@ -0,0 +1,154 @@
+"""
+Career Compass Platform - Progress Tracking
+Topic totals per role and completion counts per student
+"""
+
+from catalog import get_catalog
+
+TOPIC_TOTALS_QUERY = '''
+    SELECT rp.role_id, COUNT(*) AS count
+    FROM roadmap_topics rt
+    JOIN roadmap_phases rp ON rt.phase_id = rp.id
+    GROUP BY rp.role_id
+'''
+
+ENROLLMENTS_QUERY = '''
+    SELECT e.id, e.role_id, e.enrolled_at, e.status, r.role_name, r.description,
+           COALESCE(ep.completed_topics, 0) AS completed_topics
+    FROM student_enrollments e
+    JOIN career_roles r ON e.role_id = r.id
+    LEFT JOIN enrollment_progress ep ON ep.user_id = e.user_id AND ep.role_id = e.role_id
+    WHERE e.user_id = ?
+    ORDER BY e.enrolled_at DESC, e.id DESC
+'''
+
+
+def progress_version(conn, user_id):
+    """Bumped on every enrollment or topic progress change of the student"""
+    row = conn.execute('SELECT version FROM progress_versions WHERE user_id = ?',
+                       (user_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def progress_etag(catalog, user_id, version, role_id=None):
+    """Validator of a student's progress (one role's, or every enrollment's)"""
+    scope = f'role-{role_id}' if role_id is not None else 'enrollments'
+    return f'progress-{user_id}-{scope}-c{catalog.version}-p{version}'
+
+
+def progress_percentage(completed, total):
+    return round((completed / total * 100) if total > 0 else 0, 1)
+
+
+def topic_totals(conn):
+    """Roadmap topic count per role id, cached until the catalog changes"""
+    catalog = get_catalog(conn)
+    totals = catalog.derived.get('topic_totals')
+    if totals is None:
+        totals = catalog.derived['topic_totals'] = {
+            row['role_id']: row['count'] for row in conn.execute(TOPIC_TOTALS_QUERY)
+        }
+    return totals
+
+
+def topic_total(conn, role_id):
+    try:
+        role_id = int(role_id)
+    except (TypeError, ValueError):
+        return 0
+    return topic_totals(conn).get(role_id, 0)
+
+
+def role_topic_ids(catalog, role_id):
+    """Ids of the topics on a role's roadmap, cached per catalog"""
+    topic_ids = catalog.derived.get('topic_ids')
+    if topic_ids is None:
+        topic_ids = catalog.derived['topic_ids'] = {
+            role: frozenset(topic['id'] for phase in phases for topic in phase['topics'])
+            for role, phases in catalog.roadmaps.items()
+        }
+    return topic_ids.get(role_id, frozenset())
+
+
+def completed_topic_ids(conn, user_id, role_id):
+    """Completed topics of an enrollment that are (still) on the role's roadmap"""
+    return [row['topic_id'] for row in conn.execute('''
+        SELECT tp.topic_id FROM topic_progress tp
+        JOIN roadmap_topics t ON t.id = tp.topic_id
+        JOIN roadmap_phases p ON p.id = t.phase_id AND p.role_id = tp.role_id
+        WHERE tp.user_id = ? AND tp.role_id = ? AND tp.completed = 1
+    ''', (user_id, role_id))]
+
+
+def apply_topic_completed(conn, user_id, role_id, topic_id, completed):
+    """
+    Mark one topic complete or incomplete inside the caller's write
+    transaction. The per-enrollment counter only moves when the topic's
+    state actually flips, so repeated or concurrent clicks cannot double
+    count. Returns the completed topic ids as of this write, read in the
+    same transaction.
+    """
+    if completed:
+        flipped = conn.execute('''
+            INSERT INTO topic_progress (user_id, role_id, topic_id, completed, completed_at)
+            VALUES (?, ?, ?, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (user_id, role_id, topic_id) DO UPDATE
+            SET completed = 1, completed_at = CURRENT_TIMESTAMP
+            WHERE completed IS NOT 1
+        ''', (user_id, role_id, topic_id)).rowcount
+        delta = 1
+    else:
+        flipped = conn.execute('''
+            UPDATE topic_progress
+            SET completed = 0, completed_at = NULL
+            WHERE user_id = ? AND role_id = ? AND topic_id = ? AND completed = 1
+        ''', (user_id, role_id, topic_id)).rowcount
+        delta = -1
+
+    if flipped:
+        conn.execute('''
+            INSERT INTO enrollment_progress (user_id, role_id, completed_topics)
+            VALUES (?, ?, MAX(?, 0))
+            ON CONFLICT (user_id, role_id) DO UPDATE
+            SET completed_topics = MAX(completed_topics + ?, 0),
+                updated_at = CURRENT_TIMESTAMP
+        ''', (user_id, role_id, delta, delta))
+
+    return completed_topic_ids(conn, user_id, role_id)
+
+
+def progress_state(role_id, completed_ids, total):
+    """Everything the roadmap page shows of one enrollment's progress"""
+    return {
+        'role_id': role_id,
+        'completed_topics': completed_ids,
+        'progress_percentage': progress_percentage(len(completed_ids), total),
+        'total_topics': total
+    }
+
+
+def role_progress_state(conn, user_id, role_id):
+    return progress_state(role_id, completed_topic_ids(conn, user_id, role_id),
+                          topic_total(conn, role_id))
+
+
+def enrollments_with_progress(conn, user_id):
+    """Every enrollment of a student with its progress, in one query"""
+    totals = topic_totals(conn)
+
+    result = []
+    for enrollment in conn.execute(ENROLLMENTS_QUERY, (user_id,)):
+        total = totals.get(enrollment['role_id'], 0)
+        completed = enrollment['completed_topics']
+        result.append({
+            'id': enrollment['id'],
+            'role_id': enrollment['role_id'],
+            'role_name': enrollment['role_name'],
+            'description': enrollment['description'],
+            'enrolled_at': enrollment['enrolled_at'],
+            'status': enrollment['status'],
+            'progress_percentage': progress_percentage(completed, total),
+            'completed_topics': completed,
+            'total_topics': total
+        })
+    return result
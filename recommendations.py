@@ -0,0 +1,266 @@
+"""
+Career Compass Platform - Recommendations
+Per-profile suggestion cache and materialized per-student top roles
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import timed
+from profiles import load_profiles
+from scoring import calculate_compatibility, score_many, top_k, top_roles
+
+RECOMMENDATION_CACHE_SIZE = int(os.environ.get('RECOMMENDATION_CACHE_SIZE', 2048))
+RECOMMENDATION_CACHE_TTL = float(os.environ.get('RECOMMENDATION_CACHE_TTL', 600))
+
+# Top roles stored per student in student_recommendations
+RECOMMENDATIONS_STORED = 10
+REFRESH_BATCH_SIZE = 200
+
+# Profile fields that affect scoring (the student's name does not)
+PROFILE_FIELDS = ('specialization', 'current_year', 'career_goal', 'timeline')
+
+
+def profile_key(profile, scoring_version):
+    """
+    Canonical hash of everything the scorer reads from a profile. Skill
+    order is kept because the first matching skill is the one reported;
+    interest order never changes a score, so interests are sorted.
+    """
+    skills = profile.get('skills') or {}
+    canonical = {
+        'v': scoring_version,
+        'skills': list(skills.items()) if isinstance(skills, dict) else skills,
+        'interests': sorted(map(str, profile.get('interest_areas') or [])),
+    }
+    for field in PROFILE_FIELDS:
+        canonical[field] = profile.get(field)
+    encoded = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class RecommendationCache:
+    """
+    Bounded LRU with a time-to-live per entry. Entries are tagged with the
+    scoring version they were computed against; the first lookup under a
+    newer version drops everything older (roadmap edits do not).
+    """
+
+    def __init__(self, maxsize=RECOMMENDATION_CACHE_SIZE, ttl=RECOMMENDATION_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self.version = version
+
+    def get(self, key, version):
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, version, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+_cache = RecommendationCache()
+
+
+def get_recommendation_cache():
+    return _cache
+
+
+def cached_recommendations(profile, catalog, compute):
+    """
+    Return compute() for this profile, reusing the result of an earlier
+    identical profile scored against the same scoring version. Cached
+    results are shared between requests and must not be mutated.
+    """
+    key = profile_key(profile, catalog.scoring_version)
+    result = _cache.get(key, catalog.scoring_version)
+    if result is None:
+        result = compute()
+        _cache.put(key, catalog.scoring_version, result)
+    return result
+
+
+# ==========================================
+# RANKING
+# ==========================================
+
+def rank_profile(profile, catalog, limit=RECOMMENDATIONS_STORED):
+    """
+    Best (role, compatibility) pairs for a profile, best first. Roles that
+    cannot reach the top are pruned by their upper bounds before scoring;
+    only the top roles get a full breakdown.
+    """
+    with timed('scoring'):
+        return [(catalog.roles[j], calculate_compatibility(profile, catalog.roles[j]))
+                for j in top_roles(profile, catalog, limit)]
+
+
+def rank_profiles(profiles, catalog, limit=RECOMMENDATIONS_STORED):
+    """
+    rank_profile for many profiles: every role is scored in one sparse
+    product over the catalog's role matrix and only each profile's top
+    roles get a full breakdown.
+    """
+    with timed('scoring'):
+        scores = score_many(profiles, catalog)
+        best = top_k(scores, limit)
+        return [[(catalog.roles[j], calculate_compatibility(profile, catalog.roles[j]))
+                 for j in best[i]]
+                for i, profile in enumerate(profiles)]
+
+
+# ==========================================
+# MATERIALIZED RECOMMENDATIONS
+# ==========================================
+
+STALE_STUDENTS_QUERY = '''
+    SELECT u.id, u.name, u.specialization, u.current_year, up.career_goal, up.timeline
+    FROM users u
+    JOIN user_preferences up ON up.user_id = u.id
+    LEFT JOIN student_recommendations sr ON sr.user_id = u.id AND sr.rank = 0
+    WHERE u.user_type = 'student' AND u.id > ?
+      AND up.skills IS NOT NULL AND up.skills != ''
+      AND (sr.catalog_version IS NULL OR sr.catalog_version != ?)  -- scoring version
+    ORDER BY u.id
+    LIMIT ?
+'''
+
+
+def recommendation_rows(user_id, ranked, scoring_version):
+    """student_recommendations rows for one student's ranked roles"""
+    return [(user_id, rank, role.id, compatibility['score'], compatibility['grade'],
+             compatibility['match_level'], json.dumps(compatibility['breakdown']), scoring_version)
+            for rank, (role, compatibility) in enumerate(ranked)]
+
+
+def replace_recommendations(conn, user_ids, rows):
+    """Swap in new rows for the given students; the caller commits"""
+    user_ids = list(user_ids)
+    for start in range(0, len(user_ids), 500):
+        chunk = user_ids[start:start + 500]
+        conn.execute(f'''
+            DELETE FROM student_recommendations
+            WHERE user_id IN ({', '.join('?' * len(chunk))})
+        ''', chunk)
+    conn.executemany('''
+        INSERT INTO student_recommendations
+            (user_id, rank, role_id, score, grade, match_level, breakdown, catalog_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+
+
+def store_recommendations(conn, user_id, ranked, scoring_version):
+    """Replace a student's stored top roles; the caller commits"""
+    replace_recommendations(conn, [user_id], recommendation_rows(user_id, ranked, scoring_version))
+
+
+def load_recommendations(conn, user_ids, scoring_version, limit=RECOMMENDATIONS_STORED):
+    """
+    Stored top roles per student id, best first. Students whose rows were
+    computed against another scoring version are left out as stale.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    placeholders = ', '.join('?' * len(user_ids))
+    rows = conn.execute(f'''
+        SELECT user_id, rank, role_id, score, grade, match_level
+        FROM student_recommendations
+        WHERE user_id IN ({placeholders}) AND rank < ? AND catalog_version = ?
+        ORDER BY user_id, rank
+    ''', (*user_ids, limit, scoring_version))
+
+    stored = {}
+    for row in rows:
+        stored.setdefault(row['user_id'], []).append(row)
+    return stored
+
+
+def refresh_stale_recommendations(conn, catalog, batch_size=REFRESH_BATCH_SIZE):
+    """
+    Recompute stored recommendations for every student whose rows are
+    missing or older than the scoring tables, one batch per write transaction.
+    Returns the number of students refreshed.
+    """
+    refreshed = 0
+    after = 0
+    while True:
+        rows = conn.execute(STALE_STUDENTS_QUERY, (after, catalog.scoring_version,
+                                                    batch_size)).fetchall()
+        if not rows:
+            return refreshed
+        after = rows[-1]['id']
+
+        ranked = rank_profiles(load_profiles(conn, rows), catalog)
+        new_rows = []
+        for row, student_ranked in zip(rows, ranked):
+            new_rows.extend(recommendation_rows(row['id'], student_ranked,
+                                                catalog.scoring_version))
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            replace_recommendations(conn, [row['id'] for row in rows], new_rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        refreshed += len(rows)
+
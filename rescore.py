@@ -0,0 +1,206 @@
+"""
+Career Compass Platform - Bulk Rescoring
+Recompute stored recommendations for the whole user base across processes
+
+    python rescore.py                # students with missing or stale results
+    python rescore.py --all          # everyone (after a scoring change)
+    python rescore.py --all --resume # continue an interrupted run
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from catalog import get_catalog, load_catalog
+from db import DATABASE_PATH, connect
+from migrations import migrate
+from profiles import load_profiles
+from recommendations import (STALE_STUDENTS_QUERY, rank_profiles, recommendation_rows,
+                             replace_recommendations)
+
+RESCORE_CHUNK_SIZE = 500
+
+ALL_STUDENTS_QUERY = '''
+    SELECT u.id, u.name, u.specialization, u.current_year, up.career_goal, up.timeline
+    FROM users u
+    JOIN user_preferences up ON up.user_id = u.id
+    WHERE u.user_type = 'student' AND u.id > ?
+      AND up.skills IS NOT NULL AND up.skills != ''
+    ORDER BY u.id
+    LIMIT ?
+'''
+
+
+# ==========================================
+# WORKERS
+# ==========================================
+
+_worker_catalog = None
+
+
+def _init_worker(path):
+    """Each worker process compiles its own copy of the catalog"""
+    global _worker_catalog
+    conn = connect(path)
+    try:
+        _worker_catalog = load_catalog(conn, with_roadmaps=False)
+    finally:
+        conn.close()
+
+
+def score_chunk(user_ids, profiles, scoring_version, catalog=None):
+    """Rank a chunk of student profiles and return their student_recommendations rows"""
+    catalog = catalog or _worker_catalog
+    if catalog.scoring_version != scoring_version:
+        raise RuntimeError(f'Scoring tables changed during rescoring '
+                           f'(v{scoring_version} -> v{catalog.scoring_version}); rerun with --resume')
+    ranked = rank_profiles(profiles, catalog)
+    rows = []
+    for user_id, student_ranked in zip(user_ids, ranked):
+        rows.extend(recommendation_rows(user_id, student_ranked, scoring_version))
+    return rows
+
+
+# ==========================================
+# CHECKPOINTS
+# ==========================================
+
+def start_run(conn, mode, scoring_version, resume=False):
+    """
+    (run id, last user id done) for a new run, or the latest unfinished one.
+    A run scored against older scoring tables is not resumed: the students
+    before its checkpoint would keep stale results, so it starts over.
+    (rescore_runs.catalog_version holds the scoring version.)
+    """
+    if resume:
+        run = conn.execute('''
+            SELECT id, last_user_id FROM rescore_runs
+            WHERE mode = ? AND catalog_version = ? AND finished_at IS NULL
+            ORDER BY id DESC LIMIT 1
+        ''', (mode, scoring_version)).fetchone()
+        if run:
+            return run['id'], run['last_user_id']
+    cursor = conn.execute('INSERT INTO rescore_runs (mode, catalog_version) VALUES (?, ?)',
+                          (mode, scoring_version))
+    conn.commit()
+    return cursor.lastrowid, 0
+
+
+def write_chunk(conn, run_id, user_ids, rows):
+    """Store one chunk's results and advance the checkpoint atomically"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        replace_recommendations(conn, user_ids, rows)
+        conn.execute('''
+            UPDATE rescore_runs
+            SET last_user_id = ?, processed = processed + ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (user_ids[-1], len(user_ids), run_id))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def finish_run(conn, run_id):
+    conn.execute('UPDATE rescore_runs SET finished_at = CURRENT_TIMESTAMP WHERE id = ?', (run_id,))
+    conn.commit()
+
+
+# ==========================================
+# RUNNER
+# ==========================================
+
+def iter_chunks(conn, rescore_all, after, scoring_version, chunk_size):
+    """Keyset-paginated chunks of (student ids, profiles)"""
+    while True:
+        if rescore_all:
+            rows = conn.execute(ALL_STUDENTS_QUERY, (after, chunk_size)).fetchall()
+        else:
+            rows = conn.execute(STALE_STUDENTS_QUERY, (after, scoring_version, chunk_size)).fetchall()
+        if not rows:
+            return
+        after = rows[-1]['id']
+        yield [row['id'] for row in rows], load_profiles(conn, rows)
+
+
+def rescore(path=DATABASE_PATH, rescore_all=False, resume=False, workers=None,
+            chunk_size=RESCORE_CHUNK_SIZE, report=print):
+    """
+    Rescore students in id order. Chunks are ranked in worker processes
+    and written back by this process, one transaction per chunk, in order,
+    so the checkpoint always marks a prefix of students as done.
+    Returns (students rescored, seconds taken).
+    """
+    workers = workers or os.cpu_count() or 1
+    conn = connect(path)
+    migrate(conn)
+    catalog = get_catalog(conn)
+    mode = 'all' if rescore_all else 'stale'
+
+    run_id, after = start_run(conn, mode, catalog.scoring_version, resume)
+    if after:
+        report(f"Resuming run {run_id} after student {after}")
+
+    chunks = iter_chunks(conn, rescore_all, after, catalog.scoring_version, chunk_size)
+    started = time.perf_counter()
+    done = 0
+
+    def record(user_ids, rows):
+        nonlocal done
+        write_chunk(conn, run_id, user_ids, rows)
+        done += len(user_ids)
+        elapsed = time.perf_counter() - started
+        report(f"  {done} profiles rescored ({done / elapsed:.0f} profiles/sec)")
+
+    try:
+        if workers == 1:
+            for user_ids, profiles in chunks:
+                record(user_ids, score_chunk(user_ids, profiles, catalog.scoring_version, catalog))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(path,)) as pool:
+                # Bounded read-ahead keeps every worker busy without
+                # holding the whole user base in memory
+                pending = deque()
+                for user_ids, profiles in chunks:
+                    pending.append((user_ids, pool.submit(score_chunk, user_ids, profiles,
+                                                          catalog.scoring_version)))
+                    if len(pending) >= workers * 2:
+                        user_ids, future = pending.popleft()
+                        record(user_ids, future.result())
+                while pending:
+                    user_ids, future = pending.popleft()
+                    record(user_ids, future.result())
+        finish_run(conn, run_id)
+    finally:
+        conn.close()
+
+    return done, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Recompute stored student recommendations.')
+    parser.add_argument('--all', action='store_true', dest='rescore_all',
+                        help='rescore every student, not only missing or stale results')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue the latest unfinished run of the same kind and scoring version')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='scoring processes (default: one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=RESCORE_CHUNK_SIZE,
+                        help='students per chunk and per write transaction')
+    parser.add_argument('--database', default=DATABASE_PATH)
+    args = parser.parse_args(argv)
+
+    done, elapsed = rescore(args.database, args.rescore_all, args.resume,
+                            args.workers, max(1, args.chunk_size))
+    rate = done / elapsed if elapsed else 0
+    print(f"Rescored {done} profiles in {elapsed:.1f}s ({rate:.0f} profiles/sec)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
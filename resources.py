@@ -0,0 +1,118 @@
+"""
+Career Compass Platform - Learning Resources
+Maps roadmap topics to documentation links
+"""
+
+import json
+import os
+from collections import deque
+from functools import lru_cache
+
+RESOURCE_LINKS_PATH = os.environ.get(
+    'RESOURCE_LINKS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'resource_links.json'))
+
+DEFAULT_RESOURCE_LINK = 'https://developer.mozilla.org/en-US/docs/Learn'
+
+LINK_CACHE_SIZE = 4096
+
+
+class ResourceLinkResolver:
+    """
+    Aho-Corasick automaton over every keyword in the link table. One pass
+    over a topic name finds all keywords it contains; the longest keyword
+    wins, and among equally long ones the earliest in the topic name.
+    """
+
+    def __init__(self, links, default=DEFAULT_RESOURCE_LINK):
+        self.default = default
+        self.links = {}
+        for keyword, url in links.items():
+            keyword = keyword.lower()
+            if keyword:
+                self.links[keyword] = url
+
+        # Trie (goto function); output holds the keywords ending at a node
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for keyword in self.links:
+            node = 0
+            for char in keyword:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                node = next_node
+            self._output[node] = (keyword,)
+
+        # Failure links, breadth first
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self._goto[node].items():
+                pending.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a {"default": url, "links": {keyword: url}} JSON table"""
+        with open(path, encoding='utf-8') as f:
+            table = json.load(f)
+        return cls(table['links'], table.get('default', DEFAULT_RESOURCE_LINK))
+
+    def resolve(self, topic_name):
+        best = None
+        best_start = None
+        node = 0
+        for end, char in enumerate((topic_name or '').lower()):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword in self._output[node]:
+                start = end - len(keyword) + 1
+                if (best is None or len(keyword) > len(best)
+                        or (len(keyword) == len(best) and start < best_start)):
+                    best, best_start = keyword, start
+        return self.links[best] if best is not None else self.default
+
+
+_resolver = ResourceLinkResolver.from_file(RESOURCE_LINKS_PATH)
+
+
+@lru_cache(maxsize=LINK_CACHE_SIZE)
+def get_mdn_link(topic_name):
+    """
+    Map topic names to MDN (Mozilla Developer Network) documentation URLs.
+    Returns appropriate learning resource link based on topic name.
+    """
+    return _resolver.resolve(topic_name)
+
+
+def use_resolver(resolver):
+    """Make get_mdn_link resolve through resolver from now on"""
+    global _resolver
+    _resolver = resolver
+    get_mdn_link.cache_clear()
+
+
+def fill_missing_links(conn):
+    """
+    Store a resolved link on every topic that has none, so roadmap reads
+    never resolve links per request. Returns the number of topics updated;
+    the caller commits.
+    """
+    topics = conn.execute('''
+        SELECT id, topic_name FROM roadmap_topics
+        WHERE resource_link IS NULL OR resource_link = ''
+    ''').fetchall()
+    conn.executemany('UPDATE roadmap_topics SET resource_link = ? WHERE id = ?',
+                     [(get_mdn_link(name or ''), topic_id) for topic_id, name in topics])
+    return len(topics)
@@ -0,0 +1,145 @@
+"""
+Career Compass Platform - JSON Responses
+Conditional GETs from version-derived ETags and gzip/brotli compression
+
+    COMPRESS_MIN_SIZE=1024   smallest JSON body (bytes) worth compressing
+    COMPRESS_LEVEL=6         gzip level (brotli uses its matching quality)
+"""
+
+import gzip
+import os
+import threading
+from collections import OrderedDict
+
+from flask import current_app, request
+from werkzeug.http import is_resource_modified
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+COMPRESSIBLE_TYPES = ('application/json',)
+
+# Most preferred first
+ENCODINGS = ('br', 'gzip')
+
+# Compressed bodies of strong-ETag responses, reused while the ETag holds
+COMPRESSED_CACHE_SIZE = 256
+
+
+# ==========================================
+# CONDITIONAL GET
+# ==========================================
+
+def _variants(etag):
+    """The ETag as sent for each content coding of the same resource"""
+    return [etag] + [f'{etag}-{encoding}' for encoding in ENCODINGS]
+
+
+def conditional_json(etag, build, last_modified=None):
+    """
+    A private, always-revalidated JSON response validated by etag, which
+    the caller derives from version numbers. build() is only called (and
+    its result serialized) when the client's copy is out of date;
+    otherwise the answer is an empty 304.
+    """
+    for variant in _variants(etag):
+        if not is_resource_modified(request.environ, etag=variant, last_modified=last_modified):
+            response = current_app.response_class(status=304)
+            response.set_etag(variant)
+            break
+    else:
+        body = build()
+        if not isinstance(body, (str, bytes)):
+            body = current_app.json.dumps(body)
+        response = current_app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+# ==========================================
+# COMPRESSION
+# ==========================================
+
+class CompressedCache:
+    """Bounded LRU of (etag, encoding) -> compressed body"""
+
+    def __init__(self, maxsize=COMPRESSED_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_compressed = CompressedCache()
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=min(11, COMPRESS_LEVEL))
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+
+
+def choose_encoding(accept_encodings):
+    for encoding in ENCODINGS:
+        if encoding == 'br' and brotli is None:
+            continue
+        if accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def compress_response(response):
+    """after_request hook: compress JSON bodies of at least COMPRESS_MIN_SIZE"""
+    if (response.mimetype not in COMPRESSIBLE_TYPES or response.status_code != 200
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None or (response.content_length or 0) < COMPRESS_MIN_SIZE:
+        return response
+
+    etag, weak = response.get_etag()
+    key = (etag, encoding) if etag and not weak else None
+    body = _compressed.get(key) if key else None
+    if body is None:
+        data = response.get_data()
+        body = compress(data, encoding)
+        if len(body) >= len(data):
+            return response
+        if key:
+            _compressed.put(key, body)
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    if etag:
+        # A strong ETag names one exact body, so each coding gets its own
+        response.set_etag(f'{etag}-{encoding}', weak)
+    return response
+
+
+def init_app(app):
+    app.after_request(compress_response)
@@ -0,0 +1,102 @@
+"""
+Career Compass Platform - Roadmaps
+Every roadmap assembled from one joined query into the catalog snapshot
+"""
+
+from flask import current_app
+
+from resources import get_mdn_link
+
+# Role and phase columns come first; everything after them is the topic row
+ROADMAPS_QUERY = '''
+    SELECT p.role_id, p.id, p.phase_number, p.phase_name, p.phase_description,
+           p.estimated_duration, t.*
+    FROM roadmap_phases p
+    LEFT JOIN roadmap_topics t ON t.phase_id = p.id
+    ORDER BY p.role_id, p.phase_number, p.id, t.topic_order, t.id
+'''
+PHASE_COLUMNS = 6
+
+
+def build_roadmaps(conn, resolve=get_mdn_link):
+    """
+    Every role's phases with their topics, in display order, as
+    {role_id: roadmap}. Links are stored at import time; resolve fills
+    any that are still missing.
+    """
+    cursor = conn.execute(ROADMAPS_QUERY)
+    topic_columns = [column[0] for column in cursor.description[PHASE_COLUMNS:]]
+
+    roadmaps = {}
+    current_phase = None
+    for row in cursor:
+        if row[1] != current_phase:
+            current_phase = row[1]
+            topics = []
+            roadmaps.setdefault(row[0], []).append({
+                'phase_number': row[2],
+                'phase_name': row[3],
+                'description': row[4],
+                'duration': row[5],
+                'topics': topics
+            })
+
+        topic = dict(zip(topic_columns, row[PHASE_COLUMNS:]))
+        if topic['id'] is None:  # Phase without topics
+            continue
+        if not topic.get('resource_link'):
+            topic['resource_link'] = resolve(topic['topic_name'] or '')
+        topics.append(topic)
+
+    # Tuples from here on: the snapshot is shared and never modified
+    return {role_id: tuple(dict(phase, topics=tuple(phase['topics'])) for phase in phases)
+            for role_id, phases in roadmaps.items()}
+
+
+def roadmap_etag(catalog, role_id):
+    return f'roadmap-{role_id}-v{catalog.version}'
+
+
+def get_roadmap_payload(catalog, role_id):
+    """
+    The /api/roadmap/<role_id> body as a dict, built from the catalog's
+    roadmaps on first use and shared from then on (do not modify it).
+    Returns None for unknown roles.
+    """
+    role = catalog.get(role_id)
+    if role is None:
+        return None
+
+    payloads = catalog.derived.setdefault('roadmap_payloads', {})
+    payload = payloads.get(role_id)
+    if payload is None:
+        payload = payloads[role_id] = {
+            'success': True,
+            'role': dict(role.row),
+            'roadmap': catalog.roadmaps.get(role_id, ())
+        }
+    return payload
+
+
+def get_roadmap_document(catalog, role_id):
+    """get_roadmap_payload serialized, once per catalog. None for unknown roles."""
+    payload = get_roadmap_payload(catalog, role_id)
+    if payload is None:
+        return None
+
+    documents = catalog.derived.setdefault('roadmaps', {})
+    document = documents.get(role_id)
+    if document is None:
+        document = documents[role_id] = current_app.json.dumps(payload)
+    return document
+
+
+def get_roadmap_bootstrap(catalog, role_id, progress):
+    """
+    The roadmap body with the student's progress added under 'progress',
+    for serializing as one document. Returns None for unknown roles.
+    """
+    payload = get_roadmap_payload(catalog, role_id)
+    if payload is None:
+        return None
+    return {**payload, 'progress': progress}
@@ -0,0 +1,539 @@
+"""
+Career Compass Platform - Compatibility Scoring Engine
+Multi-factor role matching against the compiled role catalog
+"""
+
+import heapq
+
+import numpy as np
+
+from catalog import compile_role, RoleCatalog, EARLY_CAREER_BONUS
+from skills import SkillIndex
+
+# (minimum score, grade, match level), highest first
+GRADE_BANDS = (
+    (90, 'A+', '🌟 Excellent Match'),
+    (85, 'A', '✅ Strong Match'),
+    (75, 'B+', '👍 Good Match'),
+    (65, 'B', '✓ Decent Match'),
+    (55, 'C+', '○ Fair Match'),
+)
+DEFAULT_GRADE = ('C', '⚠️ Moderate Match')
+
+SKILL_LEVEL_FACTORS = {
+    'Advanced': (1.0, 'Advanced ✓'),
+    'Intermediate': (0.8, 'Good ✓'),
+}
+DEFAULT_SKILL_FACTOR = (0.5, 'Basic')
+
+# A requirement's skill_level sets the proficiency that earns full points
+REQUIRED_LEVEL_FACTORS = {
+    'Beginner': 0.5,
+    'Intermediate': 0.8,
+    'Advanced': 1.0,
+}
+
+MISSING_SKILLS_THRESHOLD = 3
+MISSING_SKILLS_PENALTY = 5
+
+
+def grade_for(score):
+    """Map a final score to its (grade, match_level) pair"""
+    for minimum, grade, match_level in GRADE_BANDS:
+        if score >= minimum:
+            return grade, match_level
+    return DEFAULT_GRADE
+
+
+def level_credit(factor, required_level):
+    """Share of a skill's points earned at proficiency factor"""
+    required = REQUIRED_LEVEL_FACTORS.get(required_level)
+    if required is None:
+        return factor
+    return min(1.0, factor / required)
+
+
+def calculate_compatibility(user_profile, role):
+    """
+    Advanced multi-factor compatibility scoring
+    Returns score out of 100 with detailed breakdown
+    """
+    role = compile_role(role)
+
+    breakdown = {}
+    total_score = 0
+
+    # FACTOR 1: Specialization Match (30 points)
+    user_spec = user_profile.get('specialization', '')
+
+    if user_spec == role.primary_specialization:
+        spec_score = 30
+        breakdown['spec_reason'] = f"Perfect match for {user_spec}"
+    elif user_spec in role.related_specializations:
+        spec_score = 15
+        breakdown['spec_reason'] = f"Good match for {user_spec}"
+    else:
+        spec_score = 5
+        breakdown['spec_reason'] = "Can transition to this role"
+
+    breakdown['specialization'] = spec_score
+    total_score += spec_score
+
+    # FACTOR 2: Skills Match (45 points)
+    # Canonical skills each user skill demonstrates (aliases, phrases, implied)
+    user_skills = [(skill, role.skill_index.user_skill_keys(skill), level)
+                   for skill, level in user_profile.get('skills', {}).items()]
+
+    matched_skills = []
+    missing_skills = []
+    missing_optional = []
+    skills_score = 0
+
+    for req_skill, req_key, points, req_level, required in role.requirements:
+        for user_skill, user_keys, level in user_skills:
+            if req_key in user_keys:
+                # Weighted by importance and by proficiency against the level asked for
+                factor, label = SKILL_LEVEL_FACTORS.get(level, DEFAULT_SKILL_FACTOR)
+                credit = level_credit(factor, req_level)
+                skills_score += points * credit
+                if credit < 1.0 and req_level in REQUIRED_LEVEL_FACTORS:
+                    label = f"{label}, {req_level} expected"
+                matched_skills.append(f"{user_skill} ({label})")
+                break
+        else:
+            if required:
+                missing_skills.append(req_skill)
+            else:
+                missing_optional.append(req_skill)
+
+    # Cap at 45
+    skills_score = min(45, round(skills_score))
+    breakdown['skills'] = skills_score
+    breakdown['matched_skills'] = matched_skills
+    breakdown['missing_skills'] = missing_skills
+    breakdown['missing_optional_skills'] = missing_optional
+    total_score += skills_score
+
+    # FACTOR 3: Interest Alignment (20 points)
+    interests = user_profile.get('interest_areas', [])
+
+    if role.category in interests:
+        interest_score = 20
+        breakdown['interest_reason'] = f"Perfect match with your {role.category} interest"
+    elif any(interest in role.category for interest in interests):
+        interest_score = 10
+        breakdown['interest_reason'] = "Related to your interests"
+    else:
+        interest_score = 5
+        breakdown['interest_reason'] = "Good career exploration opportunity"
+
+    breakdown['interest'] = interest_score
+    total_score += interest_score
+
+    # FACTOR 4: Career Goals (5 points)
+    goal_score = 0
+    career_goal = user_profile.get('career_goal', 'First Job')
+    timeline = user_profile.get('timeline', '6 months')
+
+    if career_goal == 'First Job' and role.entry_friendly:
+        goal_score += 3
+    goal_score += role.timeline_points.get(timeline, 1)
+
+    breakdown['goals'] = min(5, goal_score)
+    total_score += breakdown['goals']
+
+    # BONUSES (up to 10 points)
+    bonus_score = role.fixed_bonus
+    bonuses = list(role.fixed_bonus_list)
+
+    if role.entry_friendly and user_profile.get('current_year', 3) <= 2:
+        bonus_score += EARLY_CAREER_BONUS
+        bonuses.append(f"🎓 Perfect for early career (+{EARLY_CAREER_BONUS})")
+
+    breakdown['bonuses'] = bonus_score
+    breakdown['bonus_list'] = bonuses
+    total_score += bonus_score
+
+    # PENALTIES
+    penalty = 0
+    penalties = []
+
+    if len(missing_skills) >= MISSING_SKILLS_THRESHOLD:
+        penalty += MISSING_SKILLS_PENALTY
+        penalties.append(f"⚠️ Missing {len(missing_skills)} critical skills (-{MISSING_SKILLS_PENALTY})")
+
+    penalty += role.fixed_penalty
+    penalties.extend(role.fixed_penalty_list)
+
+    breakdown['penalties'] = penalty
+    breakdown['penalty_list'] = penalties
+    total_score -= penalty
+
+    # Final score (0-100)
+    final_score = max(0, min(100, total_score))
+    grade, match_level = grade_for(final_score)
+
+    return {
+        'score': final_score,
+        'grade': grade,
+        'match_level': match_level,
+        'breakdown': breakdown
+    }
+
+
+# ==========================================
+# BATCH SCORING
+# ==========================================
+
+# Timelines with role-specific goal points; every other timeline is slot 2
+TIMELINE_SLOTS = {'3 months': 0, '6 months': 1}
+
+
+class RoleMatrix:
+    """
+    Role-side arrays for score_many, one column per role.
+
+    Skill requirements form a sparse roles x (skill, required level) matrix
+    of points, stored ELLPACK style: row i holds role i's requirement
+    columns and points in requirement order, padded with column -1. All
+    roles are scored with one sparse product against a profile's credit
+    per column, summed in the same order as calculate_compatibility.
+    """
+
+    def __init__(self, roles, skill_index=None):
+        self.roles = tuple(roles)
+        if skill_index is None:
+            skill_index = SkillIndex(req[0] for role in self.roles for req in role.requirements)
+        self.skills = skill_index
+
+        # Vocabulary of canonical skill keys, and of (key, required level) columns
+        keys = {}
+        columns = {}
+        width = max((len(role.requirements) for role in self.roles), default=0)
+        self.req_columns = np.full((len(self.roles), width), -1, dtype=np.intp)
+        self.req_points = np.zeros((len(self.roles), width), dtype=float)
+        self.req_required = np.zeros((len(self.roles), width), dtype=bool)
+        for i, role in enumerate(self.roles):
+            for j, (_, req_key, points, req_level, required) in enumerate(role.requirements):
+                keys.setdefault(req_key, len(keys))
+                level = req_level if req_level in REQUIRED_LEVEL_FACTORS else None
+                self.req_columns[i, j] = columns.setdefault((req_key, level), len(columns))
+                self.req_points[i, j] = points
+                self.req_required[i, j] = required
+        self.skill_keys = list(keys)
+        self.skill_positions = keys
+        self.column_key = np.array([keys[key] for key, _ in columns], dtype=np.intp)
+        # Proficiency that earns full points per column (nan: any level)
+        self.column_level = np.array([REQUIRED_LEVEL_FACTORS.get(level, np.nan)
+                                      for _, level in columns], dtype=float)
+
+        # Postings: skill key -> (roles asking for it, points at stake)
+        postings = [([], []) for _ in keys]
+        for i, role in enumerate(self.roles):
+            for _, req_key, points, _, _ in role.requirements:
+                postings[keys[req_key]][0].append(i)
+                postings[keys[req_key]][1].append(points)
+        self.skill_postings = [(np.array(rows, dtype=np.intp), np.array(points, dtype=float))
+                               for rows, points in postings]
+
+        # Specialization points per role, for every specialization a role
+        # names; any other value earns the base 5 points everywhere
+        specs = {}
+        for role in self.roles:
+            specs.setdefault(role.primary_specialization, None)
+            for spec in role.related_specializations:
+                specs.setdefault(spec, None)
+        self._specialization_points = {
+            spec: np.array([30 if spec == role.primary_specialization
+                            else 15 if spec in role.related_specializations
+                            else 5
+                            for role in self.roles], dtype=int)
+            for spec in specs
+        }
+        self._other_specialization_points = np.full(len(self.roles), 5, dtype=int)
+        self._subset_indices = None
+
+        category_ids = {}
+        self.category_index = np.array(
+            [category_ids.setdefault(role.category, len(category_ids)) for role in self.roles],
+            dtype=np.intp)
+        self.categories = list(category_ids)
+
+        self.entry_friendly = np.array([role.entry_friendly for role in self.roles], dtype=bool)
+        self.timeline_points = np.array(
+            [[role.timeline_points['3 months'] for role in self.roles],
+             [role.timeline_points['6 months'] for role in self.roles],
+             [1] * len(self.roles)], dtype=int).reshape(3, len(self.roles))
+        self.fixed_bonus = np.array([role.fixed_bonus for role in self.roles], dtype=int)
+        self.fixed_penalty = np.array([role.fixed_penalty for role in self.roles], dtype=int)
+
+    def specialization_points(self, spec):
+        # Never cached: spec comes straight from the client
+        points = self._specialization_points.get(spec, self._other_specialization_points)
+        if self._subset_indices is not None:
+            points = points[self._subset_indices]
+        return points
+
+    def freeze(self):
+        """
+        Make the arrays read-only: a matrix built before gunicorn forks is
+        then shared by every worker and never written to again
+        """
+        self.skill_keys = tuple(self.skill_keys)
+        arrays = [value for value in vars(self).values() if isinstance(value, np.ndarray)]
+        arrays += [array for posting in self.skill_postings or () for array in posting]
+        arrays += self._specialization_points.values()
+        for array in arrays:
+            array.setflags(write=False)
+        return self
+
+    def subset(self, indices):
+        """RoleMatrix for the roles at indices, sharing the skill columns"""
+        indices = np.asarray(indices, dtype=np.intp)
+        matrix = object.__new__(RoleMatrix)
+        matrix.__dict__.update(self.__dict__)
+        matrix.roles = tuple(self.roles[i] for i in indices)
+        for name in ('req_columns', 'req_points', 'req_required', 'category_index',
+                     'entry_friendly', 'fixed_bonus', 'fixed_penalty'):
+            setattr(matrix, name, getattr(self, name)[indices])
+        matrix.timeline_points = self.timeline_points[:, indices]
+        matrix.skill_postings = None
+        matrix._subset_indices = (indices if self._subset_indices is None
+                                  else self._subset_indices[indices])
+        return matrix
+
+
+def encode_roles(roles):
+    """Build (or reuse the catalog's cached) RoleMatrix"""
+    if isinstance(roles, RoleCatalog):
+        matrix = roles.derived.get('role_matrix')
+        if matrix is None:
+            matrix = roles.derived['role_matrix'] = RoleMatrix(roles.roles, roles.skill_index)
+        return matrix
+    if isinstance(roles, RoleMatrix):
+        return roles
+    return RoleMatrix(compile_role(role) for role in roles)
+
+
+def _specialization_scores(profiles, matrix):
+    specs = [profile.get('specialization', '') for profile in profiles]
+    vocabulary = {}
+    spec_index = np.array([vocabulary.setdefault(spec, len(vocabulary)) for spec in specs],
+                          dtype=np.intp)
+    table = np.array([matrix.specialization_points(spec) for spec in vocabulary],
+                     dtype=int).reshape(len(vocabulary), len(matrix.roles))
+    return table[spec_index]
+
+
+def _skill_scores(profiles, matrix):
+    """Returns (skills points, missing skill counts), both profiles x roles"""
+    n_profiles, n_roles = len(profiles), len(matrix.roles)
+
+    # Profile skills as vocabulary indices in dict order, padded with the
+    # extra "no skill" row of the match table
+    vocabulary = {}
+    encoded = []
+    for profile in profiles:
+        encoded.append([
+            (vocabulary.setdefault(skill, len(vocabulary)),
+             SKILL_LEVEL_FACTORS.get(level, DEFAULT_SKILL_FACTOR)[0])
+            for skill, level in profile.get('skills', {}).items()
+        ])
+    width = max(1, max((len(skills) for skills in encoded), default=0))
+    skill_ids = np.full((n_profiles, width), len(vocabulary), dtype=np.intp)
+    factors = np.zeros((n_profiles, width), dtype=float)
+    for i, skills in enumerate(encoded):
+        for j, (skill_id, factor) in enumerate(skills):
+            skill_ids[i, j] = skill_id
+            factors[i, j] = factor
+
+    # One index lookup per distinct user skill
+    matches = np.zeros((len(vocabulary) + 1, len(matrix.skill_keys)), dtype=bool)
+    for user_skill, u in vocabulary.items():
+        for key in matrix.skills.user_skill_keys(user_skill):
+            r = matrix.skill_positions.get(key)
+            if r is not None:
+                matches[u, r] = True
+
+    # First matching user skill (in profile order) for every skill key
+    hits = matches[skill_ids]
+    found = hits.any(axis=1)
+    first = hits.argmax(axis=1)
+    skill_factor = np.where(found, np.take_along_axis(factors, first, axis=1), 0.0)
+
+    # Credit per (skill, required level) column, as level_credit computes it
+    column_factor = skill_factor[:, matrix.column_key]
+    with np.errstate(invalid='ignore'):
+        credit = np.where(np.isnan(matrix.column_level), column_factor,
+                          np.minimum(1.0, column_factor / matrix.column_level))
+    column_found = found[:, matrix.column_key]
+
+    # Sparse product, accumulated in requirement order so float rounding
+    # matches the scalar path
+    raw = np.zeros((n_profiles, n_roles), dtype=float)
+    missing = np.zeros((n_profiles, n_roles), dtype=int)
+    for j in range(matrix.req_columns.shape[1]):
+        column = matrix.req_columns[:, j]
+        present = column >= 0
+        column = np.where(present, column, 0)
+        raw += np.where(present, matrix.req_points[:, j] * credit[:, column], 0.0)
+        missing += present & matrix.req_required[:, j] & ~column_found[:, column]
+
+    return np.minimum(45, np.round(raw)).astype(int), missing
+
+
+def _interest_scores(profiles, matrix):
+    vocabulary = {}
+    encoded = [[vocabulary.setdefault(interest, len(vocabulary))
+                for interest in profile.get('interest_areas', [])]
+               for profile in profiles]
+    mask = np.zeros((len(profiles), len(vocabulary)), dtype=int)
+    for i, interest_ids in enumerate(encoded):
+        mask[i, interest_ids] = 1
+
+    shape = (len(vocabulary), len(matrix.categories))
+    exact = np.array([[interest == category for category in matrix.categories]
+                      for interest in vocabulary], dtype=int).reshape(shape)
+    related = np.array([[interest in category for category in matrix.categories]
+                        for interest in vocabulary], dtype=int).reshape(shape)
+
+    per_category = np.where(mask @ exact > 0, 20, np.where(mask @ related > 0, 10, 5))
+    return per_category[:, matrix.category_index]
+
+
+def _fixed_scores(profiles, matrix):
+    """Every factor but skills and the missing-skills penalty, profiles x roles"""
+    total = _specialization_scores(profiles, matrix)
+    total += _interest_scores(profiles, matrix)
+
+    first_job = np.array([profile.get('career_goal', 'First Job') == 'First Job'
+                          for profile in profiles], dtype=bool)
+    timeline = np.array([TIMELINE_SLOTS.get(profile.get('timeline', '6 months'), 2)
+                         for profile in profiles], dtype=np.intp)
+    goals = np.where(first_job[:, None] & matrix.entry_friendly, 3, 0)
+    total += np.minimum(5, goals + matrix.timeline_points[timeline])
+
+    early_career = np.array([profile.get('current_year', 3) is not None
+                             and profile.get('current_year', 3) <= 2
+                             for profile in profiles], dtype=bool)
+    total += matrix.fixed_bonus
+    total += np.where(early_career[:, None] & matrix.entry_friendly, EARLY_CAREER_BONUS, 0)
+
+    total -= matrix.fixed_penalty
+    return total
+
+
+def score_many(profiles, roles):
+    """
+    Score every profile against every role in one vectorized pass.
+    Returns an int array of shape (len(profiles), len(roles)) holding the
+    same scores calculate_compatibility would give each pair.
+    """
+    profiles = list(profiles)
+    matrix = encode_roles(roles)
+    if not profiles or not matrix.roles:
+        return np.zeros((len(profiles), len(matrix.roles)), dtype=int)
+
+    total = _fixed_scores(profiles, matrix)
+
+    skills, missing = _skill_scores(profiles, matrix)
+    total += skills
+    total -= np.where(missing >= MISSING_SKILLS_THRESHOLD, MISSING_SKILLS_PENALTY, 0)
+
+    return np.clip(total, 0, 100)
+
+
+def top_k(scores, k):
+    """
+    Column indices of the k best scores in each row, best first; ties keep
+    catalog order like a stable sort over the full list would.
+    """
+    scores = np.asarray(scores)
+    n = scores.shape[-1]
+    if k >= n:
+        return np.argsort(-scores, axis=-1, kind='stable')[..., :k]
+    if k <= 0:
+        return np.zeros(scores.shape[:-1] + (0,), dtype=np.intp)
+
+    # Keep everything above the k-th best score, then the first ties with
+    # it in catalog order, and sort only those k
+    rows = scores.reshape(-1, n)
+    kth = -np.partition(-rows, k - 1, axis=1)[:, k - 1:k]
+    above = rows > kth
+    ties = rows == kth
+    keep = above | (ties & (np.cumsum(ties, axis=1) <= k - above.sum(axis=1, keepdims=True)))
+    chosen = np.nonzero(keep)[1].reshape(len(rows), k)
+    order = np.argsort(-np.take_along_axis(rows, chosen, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(chosen, order, axis=1).reshape(scores.shape[:-1] + (k,))
+
+
+# ==========================================
+# TOP-K RETRIEVAL
+# ==========================================
+
+# Roles scored exactly per step of top_roles
+RETRIEVAL_BLOCK_SIZE = 64
+
+
+def _skill_bounds(profile, matrix):
+    """
+    Most skill points each role could give the profile: the full points of
+    every requirement one of its skills matches, summed over the postings
+    of those skills only.
+    """
+    raw = np.zeros(len(matrix.roles), dtype=float)
+    keys = set()
+    for skill in profile.get('skills', {}):
+        for key in matrix.skills.user_skill_keys(skill):
+            position = matrix.skill_positions.get(key)
+            if position is not None:
+                keys.add(position)
+    for position in keys:
+        rows, points = matrix.skill_postings[position]
+        np.add.at(raw, rows, points)
+    # Rounded up so summation order can never put the bound below the score
+    return np.minimum(45, np.ceil(raw + 1e-9)).astype(int)
+
+
+def upper_bounds(profile, roles):
+    """Per-role ceiling on calculate_compatibility's score for a profile"""
+    matrix = encode_roles(roles)
+    if not matrix.roles:
+        return np.zeros(0, dtype=int)
+    bounds = _fixed_scores([profile], matrix)[0]
+    bounds += _skill_bounds(profile, matrix)
+    return np.clip(bounds, 0, 100)
+
+
+def top_roles(profile, roles, k):
+    """
+    Indices of the k best roles for one profile, best first, equal to
+    top_k(score_many([profile], roles), k)[0].
+
+    Roles are visited from the highest upper bound down and scored exactly
+    a block at a time; once the best remaining bound falls below the k-th
+    best exact score, no other role can enter the top k.
+    """
+    matrix = encode_roles(roles)
+    if k <= 0 or not matrix.roles:
+        return []
+    bounds = upper_bounds(profile, matrix)
+    # Bounds fit in a byte, where numpy's stable sort is a linear radix sort
+    order = np.argsort((100 - bounds).astype(np.uint8), kind='stable')
+
+    # Min-heap of the best (score, -index) pairs so far; larger is better
+    best = []
+    for start in range(0, len(order), RETRIEVAL_BLOCK_SIZE):
+        block = order[start:start + RETRIEVAL_BLOCK_SIZE]
+        if len(best) == k:
+            block = block[bounds[block] >= best[0][0]]
+            if not len(block):
+                break
+        scores = score_many([profile], matrix.subset(block))[0]
+        for index, score in zip(block.tolist(), scores.tolist()):
+            entry = (score, -index)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+    return [-index for _, index in sorted(best, reverse=True)]
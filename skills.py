@@ -0,0 +1,163 @@
+"""
+Career Compass Platform - Skill Normalization & Matching
+Canonical skill names, aliases and a token-trie lookup for user skills
+"""
+
+import re
+
+# Tokens keep the characters that make skill names distinct (C++, C#, Node.js)
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+
+# Alternative spellings -> canonical skill name
+SKILL_ALIASES = {
+    'js': 'JavaScript',
+    'ecmascript': 'JavaScript',
+    'ts': 'TypeScript',
+    'py': 'Python',
+    'python3': 'Python',
+    'golang': 'Go',
+    'c sharp': 'C#',
+    'cpp': 'C++',
+    'node': 'Node.js',
+    'nodejs': 'Node.js',
+    'reactjs': 'React',
+    'react.js': 'React',
+    'vue': 'Vue.js',
+    'vuejs': 'Vue.js',
+    'nextjs': 'Next.js',
+    'postgres': 'PostgreSQL',
+    'mongo': 'MongoDB',
+    'amazon web services': 'AWS',
+    'microsoft azure': 'Azure',
+    'google cloud': 'GCP',
+    'google cloud platform': 'GCP',
+    'k8s': 'Kubernetes',
+    'ml': 'Machine Learning',
+    'dl': 'Deep Learning',
+    'ai': 'Artificial Intelligence',
+    'natural language processing': 'NLP',
+    'cv': 'Computer Vision',
+    'stats': 'Statistics',
+    'data viz': 'Data Visualization',
+    'dataviz': 'Data Visualization',
+    'dsa': 'Algorithms',
+    'data structures and algorithms': 'Algorithms',
+    'cyber security': 'Cybersecurity',
+    'infosec': 'Security',
+    'information security': 'Security',
+    'pentesting': 'Penetration Testing',
+    'ir': 'Incident Response',
+    'tcp': 'TCP/IP',
+    'continuous integration': 'CI/CD',
+    'software architecture': 'Architecture',
+    'system design': 'Architecture',
+    'computer networks': 'Networking',
+}
+
+# Canonical skill -> broader skills it also demonstrates
+SKILL_IMPLIES = {
+    'PostgreSQL': ('SQL',),
+    'MySQL': ('SQL',),
+    'SQLite': ('SQL',),
+    'TypeScript': ('JavaScript',),
+    'Deep Learning': ('Machine Learning',),
+    'Cybersecurity': ('Security',),
+    'Penetration Testing': ('Security',),
+    'Network Security': ('Security',),
+}
+
+# Memoized user skill lookups per index before the memo is reset
+USER_SKILL_CACHE_SIZE = 10000
+
+
+def tokenize(name):
+    return tuple(TOKEN_PATTERN.findall((name or '').lower()))
+
+
+def normalize(name):
+    """Lower-cased, punctuation-insensitive form used as a skill key"""
+    return ' '.join(tokenize(name))
+
+
+class SkillIndex:
+    """
+    Maps any skill spelling to canonical skill keys.
+
+    Required skills are canonicalized by a single alias lookup. A user
+    skill is matched against a token trie of every known skill name and
+    alias, so "Advanced SQL" finds SQL while "NoSQL" and "MySQL" do not
+    (MySQL reaches SQL only through SKILL_IMPLIES).
+    """
+
+    def __init__(self, skill_names=()):
+        self.aliases = {}
+        self.display = {}
+        for alias, canonical in SKILL_ALIASES.items():
+            self.aliases[normalize(alias)] = normalize(canonical)
+            self._add_canonical(canonical)
+        for canonical, implied in SKILL_IMPLIES.items():
+            self._add_canonical(canonical)
+            for name in implied:
+                self._add_canonical(name)
+        for name in skill_names:
+            if normalize(name):
+                self.display.setdefault(self.canonical(name), name)
+
+        self.implies = {}
+        for canonical, implied in SKILL_IMPLIES.items():
+            self.implies[normalize(canonical)] = tuple(normalize(name) for name in implied)
+
+        # Token trie over every canonical name and alias; terminal nodes
+        # store the canonical key under None
+        self.trie = {}
+        for key in list(self.display) + list(self.aliases):
+            node = self.trie
+            for token in key.split(' '):
+                node = node.setdefault(token, {})
+            node[None] = self.canonical(key)
+
+        self._user_cache = {}
+
+    def _add_canonical(self, name):
+        self.display.setdefault(normalize(name), name)
+
+    def canonical(self, name):
+        """Canonical key for a skill name (itself if unknown)"""
+        key = normalize(name)
+        return self.aliases.get(key, key)
+
+    def _with_implied(self, keys):
+        pending = list(keys)
+        found = set(pending)
+        while pending:
+            for implied in self.implies.get(pending.pop(), ()):
+                if implied not in found:
+                    found.add(implied)
+                    pending.append(implied)
+        return found
+
+    def user_skill_keys(self, name):
+        """
+        Every canonical skill a user skill demonstrates: its own canonical
+        key plus any known skill appearing as a whole-token phrase in it.
+        """
+        cached = self._user_cache.get(name)
+        if cached is not None:
+            return cached
+
+        tokens = tokenize(name)
+        keys = {self.canonical(name)} if tokens else set()
+        for start in range(len(tokens)):
+            node = self.trie
+            for token in tokens[start:]:
+                node = node.get(token)
+                if node is None:
+                    break
+                if None in node:
+                    keys.add(node[None])
+
+        result = frozenset(self._with_implied(keys))
+        if len(self._user_cache) >= USER_SKILL_CACHE_SIZE:
+            self._user_cache.clear()
+        self._user_cache[name] = result
+        return result
@@ -0,0 +1,103 @@
+"""
+Career Compass Platform - Startup
+Warm-up that runs once before serving, and a readiness endpoint
+
+The warm-up creates or migrates the database (seeding it when the file is
+missing), then compiles the catalog and every Jinja template. Last, it
+freezes the heap with gc.freeze(). Importing app.py does none of this.
+Under gunicorn with preload_app (see gunicorn.conf.py) it runs once in the
+master, from the when_ready hook. Forked workers start warm and share those
+pages copy-on-write, and the collector never rewrites them. `python app.py`
+warms up before serving. Any other server (flask run, a test client) warms
+up on its first request.
+
+/readyz answers 200 once the process is warm and the database answers.
+"""
+
+import gc
+import os
+import threading
+import time
+
+from catalog import get_catalog, warm_catalog
+from db import DATABASE_PATH, connect, get_db
+from migrations import migrate
+
+
+def warm_up(app, path=None):
+    """Build everything the first requests would otherwise build on their own"""
+    path = path or DATABASE_PATH
+    started = time.perf_counter()
+
+    if not os.path.exists(path):
+        # First boot (e.g. a fresh Railway volume): create and seed it
+        import init_database
+        init_database.main(path)
+
+    conn = connect(path)
+    try:
+        migrate(conn)
+        catalog = get_catalog(conn)
+    finally:
+        conn.close()
+    warm_catalog(catalog)
+
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+    # Everything built so far lives as long as the process: move it out of
+    # the collector's reach so neither it nor forked workers touch it again
+    gc.freeze()
+
+    app.extensions['startup'] = {
+        'ready': True,
+        'pid': os.getpid(),
+        'warm_up_ms': round((time.perf_counter() - started) * 1000, 1),
+        'frozen_objects': gc.get_freeze_count(),
+    }
+
+
+_warm_up_lock = threading.Lock()
+
+
+def ensure_warm(app):
+    """warm_up unless this process, or the master it was forked from, already has"""
+    if app.extensions['startup']['ready']:
+        return
+    with _warm_up_lock:
+        if not app.extensions['startup']['ready']:
+            try:
+                warm_up(app)
+            except Exception as e:
+                app.extensions['startup'] = {'ready': False, 'error': repr(e)}
+                raise
+
+
+def init_app(app):
+    """Register /readyz, and the first-request warm-up for servers without hooks"""
+    from flask import jsonify, request
+
+    app.extensions.setdefault('startup', {'ready': False})
+
+    def warm_before_request():
+        # The probe must answer right away, cold or not
+        if request.endpoint != 'readyz':
+            ensure_warm(app)
+
+    app.before_request(warm_before_request)
+
+    def readiness():
+        state = app.extensions['startup']
+        if not state['ready']:
+            return jsonify({'ready': False, 'pid': os.getpid(), 'error': state.get('error')}), 503
+        catalog = get_catalog(get_db())
+        return jsonify({
+            'ready': True,
+            'pid': os.getpid(),
+            'warmed_in_pid': state['pid'],
+            'warm_up_ms': state['warm_up_ms'],
+            'catalog_version': catalog.version,
+            'roles': len(catalog),
+        })
+
+    app.add_url_rule('/readyz', 'readyz', readiness)
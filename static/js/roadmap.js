@@ -0,0 +1,210 @@
+const container = document.getElementById('roadmapContainer');
+let completedTopicIds = [];
+
+// Toggle topic completion
+async function toggleTopicProgress(topicId, completed) {
+    try {
+        const response = await fetch('/api/progress/toggle', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                role_id: roleId,
+                topic_id: topicId,
+                completed: completed
+            })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            // The response carries the whole completed set
+            completedTopicIds = data.completed_topic_ids;
+            showProgress(data);
+
+            // Update topic box styling
+            const checkbox = document.getElementById(`topic-${topicId}`);
+            const topicBox = checkbox.closest('.topic-box');
+            if (completed) {
+                topicBox.style.opacity = '0.7';
+                topicBox.style.borderColor = 'var(--success)';
+            } else {
+                topicBox.style.opacity = '1';
+                topicBox.style.borderColor = '';
+            }
+        }
+    } catch (error) {
+        console.error('Failed to update progress:', error);
+        // Revert checkbox on error
+        document.getElementById(`topic-${topicId}`).checked = !completed;
+    }
+}
+
+// Show how far along the roadmap the student is
+function showProgress(progress) {
+    document.getElementById('roadmapProgress').textContent =
+        `✅ ${completedTopicIds.length}/${progress.total_topics} topics completed (${progress.progress_percentage}%)`;
+}
+
+// Fetch the roadmap together with the student's progress
+function loadRoadmapWithProgress() {
+    fetch(`/api/roadmap/${roleId}/bootstrap`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                completedTopicIds = data.progress.completed_topics;
+                showProgress(data.progress);
+                renderRoadmap(data);
+            } else {
+                alert('No roadmap available for this role yet. Coming soon!');
+                window.location.href = '/roles';
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            // Show placeholder roadmap
+            showPlaceholderRoadmap();
+        });
+
+    function renderRoadmap(data) {
+        document.getElementById('loading').style.display = 'none';
+
+        // Update header
+        document.getElementById('roleTitle').textContent =
+            `🎯 ${data.role.role_name} Roadmap`;
+        document.getElementById('roleDescription').textContent =
+            data.role.description;
+
+        if (!data.roadmap || data.roadmap.length === 0) {
+            showPlaceholderRoadmap();
+            return;
+        }
+
+        data.roadmap.forEach((phase, phaseIndex) => {
+            const phaseDiv = document.createElement('div');
+            phaseDiv.className = 'roadmap-phase';
+            phaseDiv.style.animationDelay = `${phaseIndex * 0.1}s`;
+
+            phaseDiv.innerHTML = `
+            <div class="phase-header">
+                <div class="phase-number">
+                    ${phase.phase_number}
+                </div>
+                <div class="phase-info">
+                    <h2 class="phase-title">${phase.phase_name}</h2>
+                    <p class="phase-description">${phase.description}</p>
+                    <span class="phase-duration">⏱️ ${phase.duration}</span>
+                </div>
+            </div>
+
+            <div class="topics-flowchart" id="phase-${phase.phase_number}-topics">
+                <!-- Topics will be inserted here -->
+            </div>
+        `;
+
+            container.appendChild(phaseDiv);
+
+            // Add topics
+            const topicsGrid = document.getElementById(`phase-${phase.phase_number}-topics`);
+
+            phase.topics.forEach((topic, topicIndex) => {
+                const topicBox = document.createElement('div');
+                topicBox.className = 'topic-box';
+                if (topic.is_essential) topicBox.classList.add('essential');
+                if (topic.is_checkpoint) topicBox.classList.add('checkpoint');
+                topicBox.style.animationDelay = `${(phaseIndex * 0.1) + (topicIndex * 0.05)}s`;
+                topicBox.style.position = 'relative';
+
+                // Check if topic is completed
+                const isCompleted = completedTopicIds.includes(topic.id);
+                if (isCompleted) {
+                    topicBox.style.opacity = '0.7';
+                    topicBox.style.borderColor = 'var(--success)';
+                }
+
+                topicBox.innerHTML = `
+                <div style="position: absolute; top: 1rem; right: 1rem; z-index: 10;">
+                    <input type="checkbox" 
+                           id="topic-${topic.id}" 
+                           class="topic-checkbox"
+                           onchange="toggleTopicProgress(${topic.id}, this.checked)"
+                           ${isCompleted ? 'checked' : ''}
+                           style="width: 20px; height: 20px; cursor: pointer;">
+                </div>
+
+                <div class="topic-header">
+                    <h3 class="topic-name">${topic.topic_name}</h3>
+                    ${topic.is_essential ? '<span class="essential-badge">⭐ Essential</span>' : ''}
+                    ${topic.is_checkpoint ? '<span class="checkpoint-badge">🎯 Checkpoint</span>' : ''}
+                </div>
+
+                <p class="topic-description">${topic.description}</p>
+
+                <div class="topic-footer">
+                    <span class="topic-type">${topic.resource_type}</span>
+                    <a href="${topic.resource_link}" target="_blank" class="learn-btn">
+                        Learn Now →
+                    </a>
+                </div>
+            `;
+
+                topicsGrid.appendChild(topicBox);
+
+                // Add checkpoint message after checkpoint topics
+                if (topic.is_checkpoint) {
+                    const checkpoint = document.createElement('div');
+                    checkpoint.className = 'checkpoint-message';
+                    checkpoint.textContent = '🎯 Checkpoint! Build a project using what you\'ve learned before continuing.';
+                    topicsGrid.appendChild(checkpoint);
+                }
+            });
+        });
+
+        // Add completion card
+        const completionCard = document.createElement('div');
+        completionCard.className = 'completion-card';
+        completionCard.innerHTML = `
+        <div class="completion-icon">🎉</div>
+        <h2>Congratulations!</h2>
+        <p>Complete this roadmap to become a professional ${data.role.role_name}</p>
+        <p style="margin-top: 1rem; font-size: 1rem; opacity: 0.9;">
+            💡 Pro Tip: Build projects at each checkpoint to solidify your learning!
+        </p>
+    `;
+        container.appendChild(completionCard);
+    }
+
+    function showPlaceholderRoadmap() {
+        document.getElementById('loading').style.display = 'none';
+
+        const container = document.getElementById('roadmapContainer');
+        container.innerHTML = `
+        <div style="background: var(--bg-secondary); padding: 3rem; border-radius: var(--border-radius-lg); text-align: center; box-shadow: var(--shadow-md);">
+            <div style="font-size: 4rem; margin-bottom: 1rem;">🚧</div>
+            <h2 style="font-size: 2rem; margin-bottom: 1rem;">Roadmap Coming Soon!</h2>
+            <p style="color: var(--text-secondary); font-size: 1.1rem; max-width: 600px; margin: 0 auto;">
+                We're currently building detailed roadmaps for all 59 career roles. 
+                This role's roadmap will be available soon!
+            </p>
+            <p style="margin-top: 2rem;">
+                <a href="/roles" class="btn btn-primary">
+                    ← Back to Career Matches
+                </a>
+            </p>
+        </div>
+        `;
+    }
+}
+
+// Call the function to load roadmap with progress
+loadRoadmapWithProgress();
+
+// Theme toggle
+const themeToggle = document.getElementById('themeToggle');
+const currentTheme = localStorage.getItem('theme') || 'light';
+document.documentElement.setAttribute('data-theme', currentTheme);
+themeToggle.checked = (currentTheme === 'dark');
+themeToggle.addEventListener('change', function () {
+    const newTheme = this.checked ? 'dark' : 'light';
+    document.documentElement.setAttribute('data-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+});
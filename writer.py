@@ -0,0 +1,199 @@
+"""
+Career Compass Platform - Write Coordinator
+One writer thread per worker that group-commits request writes
+
+    WRITE_BATCH_SIZE=64      most write intents committed in one transaction
+    WRITE_MAX_DELAY_MS=0     how long a batch waits for more intents to join it
+    WRITE_TIMEOUT=10         seconds a request waits for its write to commit
+
+Requests keep reading through their pooled connections (WAL snapshots);
+only writes queue here, so a worker holds SQLite's write lock once per
+batch instead of once per request. Intents that arrive while a batch is
+committing form the next batch, so batches grow with load even without
+a delay; a delay only pays off when commits are slow (synchronous=FULL).
+"""
+
+import contextvars
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from db import connect
+from metrics import timed
+
+WRITE_BATCH_SIZE = int(os.environ.get('WRITE_BATCH_SIZE', 64))
+WRITE_MAX_DELAY = float(os.environ.get('WRITE_MAX_DELAY_MS', 0)) / 1000
+WRITE_TIMEOUT = float(os.environ.get('WRITE_TIMEOUT', 10))
+
+
+class WriteTimeout(RuntimeError):
+    """A write was not acknowledged within WRITE_TIMEOUT seconds"""
+
+
+class WriteIntent:
+    """
+    One caller's write: write(conn, *args), run inside a shared transaction
+    and in a copy of the caller's context, so its statements count towards
+    the caller's request metrics
+    """
+
+    __slots__ = ('write', 'args', 'context', 'done', 'result', 'error')
+
+    def __init__(self, write, args):
+        self.write = write
+        self.args = args
+        self.context = contextvars.copy_context()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class WriteCoordinator:
+    """
+    Callers submit write functions and block until their batch commits.
+    Each intent runs under its own savepoint, so one failing intent (say
+    a duplicate email) is rolled back and reported to its caller alone;
+    the rest of the batch still commits.
+    """
+
+    def __init__(self, path=None, batch_size=WRITE_BATCH_SIZE, max_delay=WRITE_MAX_DELAY,
+                 timeout=WRITE_TIMEOUT):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.writes = 0  # committed intents
+        self.failed = 0  # intents rolled back, alone or with their batch
+        self.largest_batch = 0
+        self.commit_time = 0.0
+
+    def submit(self, write, *args):
+        """Run write(conn, *args) on the writer; returns its result once committed"""
+        self._ensure_thread()
+        intent = WriteIntent(write, args)
+        # Queueing plus the batch's commit, as the 'write' section
+        with timed('write'):
+            self._queue.put(intent)
+            acknowledged = intent.done.wait(self.timeout)
+        if not acknowledged:
+            # Still queued or in flight; it may commit later
+            raise WriteTimeout(f'Write not acknowledged after {self.timeout}s')
+        if intent.error is not None:
+            raise intent.error
+        return intent.result
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        conn = None
+        while True:
+            batch = self._next_batch()
+            try:
+                if conn is None:
+                    conn = connect(self.path)
+                self._commit(conn, batch)
+            except Exception as e:
+                # The whole transaction failed (e.g. the database stayed
+                # locked); start over on a fresh connection
+                for intent in batch:
+                    intent.error = e
+                with self._lock:
+                    self.failed += len(batch)
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except sqlite3.Error:
+                        pass
+                    conn = None
+            finally:
+                for intent in batch:
+                    intent.done.set()
+
+    def _commit(self, conn, batch):
+        started = time.perf_counter()
+        conn.execute('BEGIN IMMEDIATE')
+        failed = 0
+        try:
+            for intent in batch:
+                conn.execute('SAVEPOINT intent')
+                try:
+                    intent.result = intent.context.run(intent.write, conn, *intent.args)
+                except Exception as e:
+                    conn.execute('ROLLBACK TO intent')
+                    intent.error = e
+                    failed += 1
+                conn.execute('RELEASE intent')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        with self._lock:
+            self.batches += 1
+            self.writes += len(batch) - failed
+            self.failed += failed
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.commit_time += time.perf_counter() - started
+
+    def stats(self):
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'writes': self.writes,
+                'failed': self.failed,
+                'largest_batch': self.largest_batch,
+                'queued': self._queue.qsize(),
+                'commit_time': self.commit_time,
+                'writes_per_batch': self.writes / self.batches if self.batches else 0,
+            }
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """The coordinator for this worker (a forked worker starts its own)"""
+    global _writer
+    writer = _writer
+    if writer is not None and writer.pid == os.getpid():
+        return writer
+    with _writer_lock:
+        if _writer is None or _writer.pid != os.getpid():
+            _writer = WriteCoordinator()
+        return _writer
+
+
+def submit_write(write, *args):
+    """Shortcut for get_writer().submit(write, *args)"""
+    return get_writer().submit(write, *args)